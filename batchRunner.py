@@ -0,0 +1,126 @@
+import argparse
+import copy
+import json
+import math as m
+import os
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import eventSimulation as ev
+import rngStreams
+import simulationSettings as settings
+
+# Metrics aggregated over replications
+METRICS = ("lifetime", "delivered", "lost")
+
+def run_replication(sim_settings, max_steps=None, seed=None, engine="frame", fast_forward=False):
+    """
+    Run one headless simulation to completion; executed inside a worker process.
+
+    :param sim_settings: SimulationSettings of the run.
+    :param max_steps: Optional limit of steps per run.
+    :param seed: Seed of the run's random streams; overrides the seed in sim_settings.
+    :param engine: Key of eventSimulation.ENGINES, 'frame' or 'event'.
+    :param fast_forward: Skip idle stretches analytically between steps.
+    :return: Dict with the seed, network lifetime (s), final stats values and whether the run stopped on its own.
+    """
+    sim_settings = copy.copy(sim_settings)
+    sim_settings.set_seed(seed)
+    sim = ev.ENGINES[engine](sim_settings)
+    sim.run(max_steps, fast_forward)
+    result = dict(sim.stats_values)
+    result["seed"] = sim.seed
+    result["lifetime"] = sim.sim_time / 1000
+    result["steps"] = sim.steps
+    result["stopped"] = sim.STOP_SIM
+    return result
+
+def confidence_interval(values, z=1.96):
+    """
+    Normal-approximation confidence interval of the mean.
+
+    :param values: Array of samples.
+    :param z: Quantile of the standard normal distribution (1.96 for 95%).
+    :return: Tuple (mean, std, low, high).
+    """
+    mean = float(np.mean(values))
+    std = float(np.std(values, ddof=1)) if len(values) > 1 else 0.0
+    half = z * std / m.sqrt(len(values))
+    return mean, std, mean - half, mean + half
+
+def aggregate(results):
+    """
+    Aggregate per-replication results into distributions with confidence intervals.
+
+    :param results: List of dicts returned by run_replication.
+    :return: Dict metric -> {values, mean, std, ci_low, ci_high}.
+    """
+    summary = {}
+    for metric in METRICS:
+        values = np.array([result.get(metric, 0) for result in results], dtype=np.float64)
+        mean, std, low, high = confidence_interval(values)
+        summary[metric] = {"values": values, "mean": mean, "std": std, "ci_low": low, "ci_high": high}
+    summary["censored"] = sum(1 for result in results if not result["stopped"])
+    return summary
+
+def run_batch(sim_settings, replications, max_steps=None, workers=None, engine="frame", fast_forward=False):
+    """
+    Fan out replications of one configuration across a process pool using all cores.
+    Every replication gets its own seed derived from the settings' seed, so a batch
+    with a fixed seed is reproducible and any single run can be replayed.
+
+    :param sim_settings: SimulationSettings shared by all replications.
+    :param replications: Number of independent runs.
+    :param max_steps: Optional limit of steps per run; runs hitting it are counted as censored.
+    :param workers: Number of worker processes, defaults to the number of CPUs.
+    :param engine: Key of eventSimulation.ENGINES, 'frame' or 'event'.
+    :param fast_forward: Skip idle stretches analytically between steps.
+    :return: Tuple (list of per-run results, aggregated summary).
+    """
+    workers = workers or os.cpu_count()
+    seeds = rngStreams.spawn_seeds(sim_settings.get_seed(), replications)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(run_replication, [sim_settings] * replications, [max_steps] * replications, seeds, [engine] * replications, [fast_forward] * replications))
+    return results, aggregate(results)
+
+def parse_args():
+    """Parse command line arguments of a batch run."""
+    parser = argparse.ArgumentParser(description="Run many replications of one configuration in parallel.")
+    parser.add_argument("sensors", type=int, help="number of sensors")
+    parser.add_argument("pois", type=int, help="number of POIs")
+    parser.add_argument("range", type=int, help="sensors range")
+    parser.add_argument("--replications", type=int, default=100, help="number of independent runs")
+    parser.add_argument("--max-steps", type=int, default=None, help="maximum number of steps per run")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--world-size", type=int, default=640, help="side of the simulated area in world units")
+    parser.add_argument("--seed", type=int, default=None, help="root seed of the batch")
+    parser.add_argument("--engine", choices=sorted(ev.ENGINES), default="frame", help="per-frame or discrete-event engine")
+    parser.add_argument("--fast-forward", action="store_true", help="skip idle stretches analytically between steps")
+    parser.add_argument("--topology-cache", default=None, help="directory caching layouts of seeded runs")
+    parser.add_argument("--output", default=None, help="optional JSON file for per-run results and summary")
+    return parser.parse_args()
+
+def main():
+    """Run a batch from the command line and print the aggregated distributions."""
+    args = parse_args()
+    sim_settings = settings.SimulationSettings()
+    sim_settings.set_snum(args.sensors)
+    sim_settings.set_pnum(args.pois)
+    sim_settings.set_srange(args.range)
+    sim_settings.set_seed(args.seed)
+    sim_settings.set_world_size(args.world_size)
+    sim_settings.set_topology_cache(args.topology_cache)
+
+    results, summary = run_batch(sim_settings, args.replications, args.max_steps, args.workers, args.engine, args.fast_forward)
+    for metric in METRICS:
+        row = summary[metric]
+        print(f"{metric}: mean {row['mean']:.2f} std {row['std']:.2f} 95% CI [{row['ci_low']:.2f}, {row['ci_high']:.2f}]")
+    print(f"censored runs: {summary['censored']} / {len(results)}")
+
+    if args.output:
+        for metric in METRICS:
+            summary[metric]["values"] = summary[metric]["values"].tolist()
+        with open(args.output, "w") as file:
+            json.dump({"runs": results, "summary": summary}, file, indent=2)
+
+if __name__ == "__main__":
+    main()
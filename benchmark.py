@@ -0,0 +1,162 @@
+import argparse
+import json
+import math as m
+import platform
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor
+import simulation as s
+import simulationSettings as settings
+try:
+    import resource # Unix only
+except ImportError:
+    resource = None
+
+# Methods of Simulation timed by the benchmark, grouped into setup and per-step phases
+SETUP_PHASES = ("_init_pois_coords", "_init_sensors_coords", "_init_routing")
+STEP_PHASES = ("scan_pois", "find_path_to_central", "sleep_idle_sensors", "perform_sensor_actions", "create_stats", "generate_packets_in_pois")
+
+# Default sweep: (sensors, POIs) from the menu's range up to 100k sensors and 10k POIs
+DEFAULT_SIZES = [(60, 10), (120, 20), (1000, 100), (10000, 1000), (100000, 10000)]
+
+class TimedSimulation(s.Simulation):
+    """Simulation that accumulates the wall time spent in each phase method."""
+    def __init__(self, *args, **kwargs):
+        self.phase_times = {}
+        super().__init__(*args, **kwargs)
+
+def _timed(name):
+    """Build an override of Simulation.<name> that adds its duration to phase_times."""
+    method = getattr(s.Simulation, name)
+    def wrapper(self, *args, **kwargs):
+        start = time.perf_counter()
+        result = method(self, *args, **kwargs)
+        self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+        return result
+    return wrapper
+
+for _name in SETUP_PHASES + STEP_PHASES:
+    setattr(TimedSimulation, _name, _timed(_name))
+
+def run_case(sensors, pois, srange, steps, seed):
+    """
+    Benchmark one network size; executed in a fresh process so peak memory is per case.
+
+    :param sensors: Number of sensors.
+    :param pois: Number of POIs.
+    :param srange: Sensors range.
+    :param steps: Number of simulation steps to time.
+    :param seed: Seed of the run.
+    :return: Dict with setup and per-step phase times, steps/s and peak memory.
+    """
+    sim_settings = settings.SimulationSettings()
+    sim_settings.set_snum(sensors)
+    sim_settings.set_pnum(pois)
+    sim_settings.set_srange(srange)
+    sim_settings.set_seed(seed)
+    # Grow the world with the network so the density matches the menu's default (100 sensors on 640x640)
+    sim_size = int(640 * m.sqrt(max(sensors, 100) / 100))
+    sim_settings.set_world_size(sim_size)
+
+    start = time.perf_counter()
+    sim = TimedSimulation(sim_settings)
+    setup_time = time.perf_counter() - start
+    setup = {name: sim.phase_times.pop(name, 0.0) for name in SETUP_PHASES}
+    sim.phase_times.clear()
+
+    start = time.perf_counter()
+    done = 0
+    while done < steps and not sim.STOP_SIM:
+        sim.perform_actions()
+        done += 1
+    step_time = time.perf_counter() - start
+
+    return {
+        "sensors": len(sim.sensors),
+        "pois": len(sim.pois),
+        "range": srange,
+        "area": sim_size,
+        "setup_s": setup_time,
+        "setup_phases_s": setup,
+        "steps": done,
+        "stopped_early": done < steps,
+        "steps_per_s": done / step_time if step_time > 0 else 0.0,
+        "step_phases_ms": {name: 1000 * sim.phase_times.get(name, 0.0) / max(done, 1) for name in STEP_PHASES},
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+def peak_memory_mb():
+    """Return the peak resident memory of this process in MiB, or None where it cannot be read."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / (1024 * 1024) if platform.system() == "Darwin" else peak / 1024
+
+def git_revision():
+    """Return the current git commit of the tree, if available."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(current, baseline):
+    """
+    Print steps/s and setup time of current results relative to a baseline results file.
+
+    :param current: List of case results.
+    :param baseline: Results dict loaded from an earlier run.
+    """
+    previous = {(case["sensors"], case["pois"]): case for case in baseline["cases"]}
+    for case in current:
+        old = previous.get((case["sensors"], case["pois"]))
+        if old is None:
+            continue
+        speed = case["steps_per_s"] / old["steps_per_s"] if old["steps_per_s"] else float("nan")
+        setup = case["setup_s"] / old["setup_s"] if old["setup_s"] else float("nan")
+        print(f"{case['sensors']:>7} sensors: steps/s x{speed:.2f}, setup time x{setup:.2f} vs {baseline.get('revision')}")
+
+def parse_args():
+    """Parse command line arguments of the benchmark."""
+    parser = argparse.ArgumentParser(description="Benchmark placement, routing and step throughput against network size.")
+    parser.add_argument("--sensors", type=int, nargs="*", default=None, help="sensor counts to sweep (POIs = sensors / 10)")
+    parser.add_argument("--range", type=int, default=250, help="sensors range")
+    parser.add_argument("--steps", type=int, default=200, help="timed steps per case")
+    parser.add_argument("--seed", type=int, default=1, help="seed shared by all cases")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file for the results")
+    parser.add_argument("--compare", default=None, help="earlier results file to compare against")
+    return parser.parse_args()
+
+def main():
+    """Run the sweep, print a table and store the results as JSON."""
+    args = parse_args()
+    sizes = [(n, max(10, n // 10)) for n in args.sensors] if args.sensors else DEFAULT_SIZES
+
+    cases = []
+    print(f"{'sensors':>8} {'pois':>6} {'setup s':>8} {'steps/s':>9} {'peak MB':>8}  slowest phase")
+    for sensors, pois in sizes:
+        # One process per case keeps peak memory measurements independent
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            case = pool.submit(run_case, sensors, pois, args.range, args.steps, args.seed).result()
+        cases.append(case)
+        slowest = max(case["step_phases_ms"].items(), key=lambda item: item[1])
+        peak = "n/a" if case["peak_memory_mb"] is None else f"{case['peak_memory_mb']:.0f}"
+        print(f"{case['sensors']:>8} {case['pois']:>6} {case['setup_s']:>8.2f} {case['steps_per_s']:>9.0f} {peak:>8}  {slowest[0]} {slowest[1]:.3f} ms")
+
+    results = {
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "range": args.range,
+        "steps": args.steps,
+        "cases": cases,
+    }
+    with open(args.output, "w") as file:
+        json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            compare(cases, json.load(file))
+
+if __name__ == "__main__":
+    main()
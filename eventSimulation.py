@@ -0,0 +1,171 @@
+import heapq
+import math as m
+import numpy as np
+import sensor as s
+import simulation
+
+class EventSimulation(simulation.Simulation):
+    """
+    Discrete-event variant of the Simulation.
+    Instead of running every TICK_MS step, the next step at which something can happen is
+    taken from a heap-ordered event queue: packet generation, POI collection, battery depletion
+    (computed analytically from the idle drain rate), random failures (exponential inter-arrival
+    times) and follow-up work such as forwarding or route repair. Steps in between are skipped;
+    their only effect, the idle battery drain, is applied in one operation.
+    Processed steps run the same code as the per-frame engine, so the statistics follow the same
+    model; only failures are drawn differently, so seeded runs are not identical between engines.
+    """
+    def __init__(self, settings, tick_ms=16):
+        """
+        Initialize the simulation environment and schedule the first events.
+
+        :param settings: Simulation settings/configuration object.
+        :param tick_ms: Simulation time (ms) advanced by a single step.
+        """
+        super().__init__(settings, tick_ms)
+        n = len(self.store)
+        self._schedule_failures(np.flatnonzero(self.store.state[:n] == s.State.ACTIVE.value))
+        self._schedule_after_step()
+
+    def _init_var(self):
+        """
+        Initialize runtime parameters and the event queue.
+        """
+        super()._init_var()
+        self.events = [] # Heap of (step, sensor index) entries; index -1 marks a plain wake-up
+        self.scheduled = set() # Steps with a pending wake-up entry, to avoid duplicates
+        self.fail_at = {} # Sensor index -> step of its next failure while it is active
+
+    def _on_sensor_state_change(self, indexes, old_states, new_state):
+        """
+        Record state transitions for routing and keep failure events of active sensors.
+
+        :param indexes: Array of sensors that changed state.
+        :param old_states: Array of their previous state values.
+        :param new_state: New state value.
+        """
+        super()._on_sensor_state_change(indexes, old_states, new_state)
+        if new_state == s.State.ACTIVE.value:
+            self._schedule_failures(indexes)
+        else:
+            for index in indexes[old_states == s.State.ACTIVE.value].tolist():
+                self.fail_at.pop(index, None)
+
+    def _push(self, step, index=-1):
+        """
+        Add an event to the queue.
+
+        :param step: Step at which the event happens.
+        :param index: Failing sensor, or -1 for a wake-up without own action.
+        """
+        if index < 0:
+            if step in self.scheduled:
+                return
+            self.scheduled.add(step)
+        heapq.heappush(self.events, (step, index))
+
+    def _schedule_failures(self, indexes):
+        """
+        Draw the next failure of newly active sensors as exponential inter-arrival times
+        with the per-step failure probability as rate. Without failures nothing is scheduled.
+
+        :param indexes: Array of sensor indexes.
+        """
+        if not len(indexes) or self.failure_prob <= 0:
+            return
+        delays = np.ceil(self.rng.failures.exponential(1 / self.failure_prob, len(indexes)))
+        for index, delay in zip(indexes.tolist(), delays.tolist()):
+            step = self.steps + max(1, int(delay))
+            self.fail_at[index] = step
+            self._push(step, index)
+
+    def _schedule_after_step(self):
+        """
+        Schedule the earliest step at which each kind of work becomes due after the current step.
+        Extra wake-ups are harmless: a step with nothing due behaves like a skipped one.
+        """
+        now = self.steps
+        # Pending route repair, POI scanning or forwarding happen on the very next step
+        if self.has_pending_work():
+            self._push(now + 1)
+        # Packet generation in POIs
+        self._push(max(now + 1, m.ceil((self.last_gen_packet_time + self.GEN_PACKET_INTERVAL) / self.TICK_MS)))
+        # Earliest POI collection or battery depletion of an active sensor
+        next_work = self.next_sensor_work()
+        if next_work is not None:
+            self._push(next_work)
+
+    def _pop_next_step(self, limit=None):
+        """
+        Remove all events of the earliest pending step from the queue.
+
+        :param limit: Optional last step that may be reached.
+        :return: The step to process next.
+        """
+        while self.events and self.events[0][0] <= self.steps:
+            heapq.heappop(self.events)
+        step = self.events[0][0] if self.events else self.steps + 1
+        if limit is not None and step > limit:
+            return limit
+        failing = []
+        while self.events and self.events[0][0] == step:
+            _, index = heapq.heappop(self.events)
+            if index < 0:
+                self.scheduled.discard(step)
+            elif self.fail_at.get(index) == step:
+                failing.append(index)
+        self.due_failures = np.array(failing, dtype=np.int64)
+        return step
+
+    def draw_failures(self, active, failure_prob):
+        """
+        Return active sensors whose failure event falls on this step.
+        While failures are disabled, the due sensors draw a new failure time instead.
+
+        :param active: Boolean mask of active sensors.
+        :param failure_prob: Probability of a failure per step, 0 when failures are disabled.
+        :return: Array of failing sensor indexes.
+        """
+        due = self.due_failures
+        self.due_failures = None
+        if due is None or not due.size:
+            return np.empty(0, dtype=np.int64)
+        due = due[active[due]]
+        if failure_prob <= 0:
+            self._schedule_failures(due)
+            return np.empty(0, dtype=np.int64)
+        return due
+
+    def perform_actions(self, limit=None):
+        """
+        Jump to the next step with a due event and process it like the per-frame engine.
+        The idle drain of the skipped steps is applied to active sensors first.
+
+        :param limit: Optional last step that may be reached; the clock stops there even without an event.
+        """
+        if self.STOP_SIM:
+            return
+        step = self._pop_next_step(limit)
+        skipped = step - self.steps - 1
+        if skipped > 0:
+            self.advance_idle(skipped)
+        super().perform_actions()
+        if not self.STOP_SIM:
+            self._schedule_after_step()
+
+    def run(self, max_steps=None, fast_forward=False):
+        """
+        Advance the simulation event by event until it stops on its own
+        or `max_steps` steps have been performed.
+
+        :param max_steps: Optional limit of steps; None runs until STOP_SIM.
+        :param fast_forward: Ignored; idle steps are always skipped by the event queue.
+        :return: Final list of statistics lines.
+        """
+        limit = None if max_steps is None else self.steps + max_steps
+        while not self.STOP_SIM and (limit is None or self.steps < limit):
+            self.perform_actions(limit)
+        return self.stats
+
+# Simulation engines selectable from the command line
+ENGINES = {"frame": simulation.Simulation, "event": EventSimulation}
@@ -0,0 +1,306 @@
+import json
+import os
+import shutil
+import numpy as np
+import simulation as s
+import sensorStore as store
+import poiStore
+import profiler
+import topology
+
+# Kinds of trace events; the value is the new state, next hop, in_path flag or the bits of a float32 battery level
+STATE, HOP, PATH, BATTERY = 0, 1, 2, 3
+EVENT_DTYPE = np.dtype([("step", "<i4"), ("kind", "i1"), ("index", "<i4"), ("value", "<i4")])
+# Columns of a stats row: the clock followed by all stats fields
+STATS_COLUMNS = ("steps", "sim_time") + s.STATS_FIELDS
+
+def keyframe_dtype(sensors_num):
+    """Return the record type of a keyframe of a network with `sensors_num` sensors."""
+    return np.dtype([
+        ("step", "<i8"), ("events", "<i8"), # Step of the snapshot and number of events written before it
+        ("state", "i1", (sensors_num,)), ("battery", "<f4", (sensors_num,)),
+        ("next_hop", "<i4", (sensors_num,)), ("in_path", "?", (sensors_num,)),
+    ])
+
+class TraceRecorder:
+    """
+    Writes a compact binary trace of a run into a directory:
+    - header.json with the sizes and the record layout,
+    - layout/ with the placed network (a topology.Topology),
+    - events.bin with one fixed-size record per state, next-hop and in_path change and battery recharge,
+    - stats.bin with one float64 row of STATS_COLUMNS per stats update (deliveries, losses, ...),
+    - keyframes.bin with full per-sensor snapshots every `interval` steps.
+    All files are flat arrays of fixed-size records, so a reader memory-maps them and seeks
+    to any step by binary search. Events are buffered and written at every keyframe.
+    """
+    def __init__(self, path, interval=250):
+        """
+        Create the trace directory.
+
+        :param path: Directory of the trace; existing trace files in it are replaced.
+        :param interval: Minimum number of steps between two keyframes.
+        """
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.interval = interval
+        self.sim = None
+        self.pending = [] # Buffered event arrays since the last keyframe
+        self.events_written = 0
+        self.last_keyframe = None # Step of the latest keyframe
+        self.files = {name: open(os.path.join(path, name + ".bin"), "wb") for name in ("events", "stats", "keyframes")}
+
+    def attach(self, sim):
+        """
+        Start recording a simulation: save its layout, write the first keyframe and hook into its updates.
+
+        :param sim: Simulation to record.
+        """
+        self.sim = sim
+        n = len(sim.store)
+        self.dtype = keyframe_dtype(n)
+        layout = os.path.join(self.path, "layout")
+        shutil.rmtree(layout, ignore_errors=True)
+        sim.topology.save(layout)
+        with open(os.path.join(self.path, "header.json"), "w") as file:
+            json.dump({"sensors": n, "sensors_range": sim.settings.get_srange(), "tick_ms": sim.TICK_MS, "world_size": sim.WORLD_SIZE,
+                       "seed": sim.seed, "interval": self.interval, "stats": STATS_COLUMNS}, file, indent=2)
+        sim.trace = self
+        sim.store.on_battery_set = self.record_battery
+        sim.subscribe_stats(self.record_stats)
+        self.record_stats(sim.stats_values)
+
+    def _add(self, kind, indexes, values):
+        """Buffer events of one kind stamped with the current step."""
+        if not len(indexes):
+            return
+        events = np.empty(len(indexes), dtype=EVENT_DTYPE)
+        events["step"] = self.sim.steps
+        events["kind"] = kind
+        events["index"] = indexes
+        events["value"] = values
+        self.pending.append(events)
+
+    def record_states(self, indexes, new_state):
+        """
+        Record state changes of sensors.
+
+        :param indexes: Array of sensors that changed state.
+        :param new_state: New state value.
+        """
+        self._add(STATE, indexes, new_state)
+
+    def record_hops(self, indexes, next_hops, in_path):
+        """
+        Record route changes of sensors.
+
+        :param indexes: Array of sensors whose route changed.
+        :param next_hops: Their new next hops.
+        :param in_path: Their new in_path flags.
+        """
+        self._add(HOP, indexes, next_hops)
+        self._add(PATH, indexes, in_path)
+
+    def record_battery(self, index, value):
+        """
+        Record an explicit battery change (a recharge); the steady drain is covered by keyframes.
+
+        :param index: Row of the sensor.
+        :param value: New battery level.
+        """
+        self._add(BATTERY, [index], np.float32(value).view(np.int32))
+
+    def record_stats(self, values):
+        """
+        Stats callback: write a stats row and a keyframe when one is due.
+
+        :param values: Dict with the STATS_FIELDS keys.
+        """
+        sim = self.sim
+        row = [sim.steps, sim.sim_time] + [values.get(field, 0) for field in s.STATS_FIELDS] if values else None
+        if row is not None:
+            np.array(row, dtype=np.float64).tofile(self.files["stats"])
+        if self.last_keyframe is None or sim.steps - self.last_keyframe >= self.interval:
+            self.keyframe()
+
+    def _flush_events(self):
+        """Write the buffered events."""
+        if self.pending:
+            events = np.concatenate(self.pending)
+            events.tofile(self.files["events"])
+            self.events_written += len(events)
+            self.pending = []
+
+    def keyframe(self):
+        """Write the buffered events followed by a full snapshot of the current step."""
+        self._flush_events()
+        n = len(self.sim.store)
+        frame = np.zeros(1, dtype=self.dtype)
+        frame["step"] = self.sim.steps
+        frame["events"] = self.events_written
+        for column in ("state", "battery", "next_hop", "in_path"):
+            frame[column][0] = getattr(self.sim.store, column)[:n]
+        frame.tofile(self.files["keyframes"])
+        self.last_keyframe = self.sim.steps
+
+    def close(self):
+        """Write a final keyframe, detach from the simulation and close the files."""
+        if self.sim is None:
+            return
+        if self.last_keyframe != self.sim.steps or self.pending:
+            self.keyframe()
+        self.sim.unsubscribe_stats(self.record_stats)
+        self.sim.store.on_battery_set = None
+        self.sim.trace = None
+        self.sim = None
+        for file in self.files.values():
+            file.close()
+
+def _map(path, dtype, columns=None):
+    """Memory-map a file of fixed-size records; an empty file gives an empty array."""
+    size = os.path.getsize(path)
+    itemsize = np.dtype(dtype).itemsize * (columns or 1)
+    if size < itemsize:
+        return np.empty((0, columns) if columns else 0, dtype=dtype)
+    return np.memmap(path, dtype=dtype, mode="r", shape=(size // itemsize, columns) if columns else (size // itemsize,))
+
+class TraceReplay:
+    """
+    Plays a recorded trace back with the interface of a Simulation, so SimulationInterface
+    can draw it. Any step is reached from the nearest earlier keyframe plus the events after it.
+    Battery levels are interpolated linearly towards the next keyframe, starting from the
+    earlier keyframe or from the latest recharge of the sensor; a sensor recharged again
+    before the next keyframe keeps its level until then.
+    """
+    def __init__(self, path):
+        """
+        Open a trace for reading; all data files are memory-mapped.
+
+        :param path: Directory of the trace.
+        """
+        with open(os.path.join(path, "header.json"), "r") as file:
+            self.header = json.load(file)
+        n = self.header["sensors"]
+        self.events = _map(os.path.join(path, "events.bin"), EVENT_DTYPE)
+        self.stats_rows = _map(os.path.join(path, "stats.bin"), np.float64, len(STATS_COLUMNS))
+        self.keyframes = _map(os.path.join(path, "keyframes.bin"), keyframe_dtype(n))
+        if not len(self.keyframes):
+            raise ValueError("The trace has no keyframes.")
+        self.keyframe_steps = np.asarray(self.keyframes["step"])
+        self.event_steps = self.events["step"]
+        self._init_stores(topology.Topology.load(os.path.join(path, "layout")))
+        self.seed = self.header["seed"]
+        self.TICK_MS = self.header["tick_ms"]
+        self.WORLD_SIZE = self.header["world_size"]
+        self.last_step = int(self.keyframe_steps[-1])
+        self.profiler = profiler.PhaseProfiler() # Only render timings are recorded during replay
+        self.STOP_SIM = False
+        self.applied = None # Step the store's state, next_hop and in_path columns correspond to
+        self.steps = 0
+        self.seek(0)
+
+    def _init_stores(self, layout):
+        """Rebuild the placed sensors and POIs from the saved layout."""
+        radius = self.header["sensors_range"]
+        coords = np.asarray(layout.sensor_xy, dtype=np.int64)
+        self.store = store.SensorStore()
+        self.central = self.store.add(tuple(coords[0].tolist()), radius, True)
+        self.store.add_many(coords[1:], radius)
+        self.store.trim()
+        self.sensors = self.store.views
+        self.poi_store = poiStore.PoiStore()
+        for xy, reliability in zip(np.asarray(layout.poi_xy, dtype=np.int64).tolist(), np.asarray(layout.poi_reliability).tolist()):
+            self.poi_store.add(tuple(xy), reliability)
+        self.pois = self.poi_store.views
+
+    def _apply(self, start, stop):
+        """Apply events[start:stop] to the store."""
+        events = self.events[start:stop]
+        for kind, column in ((STATE, self.store.state), (HOP, self.store.next_hop), (PATH, self.store.in_path)):
+            chosen = events[events["kind"] == kind]
+            # Later events of the same sensor overwrite earlier ones, as NumPy assigns in order
+            column[chosen["index"]] = chosen["value"]
+
+    def _battery(self, k, step, stop):
+        """
+        Estimate battery levels at `step` between keyframe k and the next one.
+
+        :param k: Index of the keyframe at or before the step.
+        :param step: Target step.
+        :param stop: Number of events up to and including the step.
+        :return: Array of battery levels.
+        """
+        frame = self.keyframes[k]
+        start_step = np.full(len(self.store), frame["step"], dtype=np.float64)
+        start_value = frame["battery"].astype(np.float64)
+        events = self.events[int(frame["events"]):stop]
+        recharges = events[events["kind"] == BATTERY]
+        # The latest recharge of a sensor overwrites earlier ones
+        start_step[recharges["index"]] = recharges["step"]
+        start_value[recharges["index"]] = recharges["value"].view(np.float32)
+        if k + 1 == len(self.keyframes):
+            return start_value
+        after = self.keyframes[k + 1]
+        share = (step - start_step) / np.maximum(after["step"] - start_step, 1)
+        # Sensors recharged again before the next keyframe have no known end point; they keep their level
+        later = self.events[stop:int(after["events"])]
+        share[later["index"][later["kind"] == BATTERY]] = 0
+        return start_value + (after["battery"] - start_value) * share
+
+    def seek(self, step):
+        """
+        Show the network as it was after `step`.
+
+        :param step: Target step, clamped to the recorded run.
+        """
+        step = max(0, min(int(step), self.last_step))
+        k = int(np.searchsorted(self.keyframe_steps, step, "right")) - 1
+        frame = self.keyframes[k]
+        stop = int(np.searchsorted(self.event_steps, step, "right"))
+        if self.applied is not None and self.applied <= step and self.applied >= frame["step"]:
+            # Playing forward within one keyframe span: only the new events are applied
+            start = int(np.searchsorted(self.event_steps, self.applied, "right"))
+        else:
+            for column in ("state", "next_hop", "in_path"):
+                getattr(self.store, column)[:] = frame[column]
+            start = int(frame["events"])
+        self._apply(start, stop)
+        self.applied = step
+
+        self.store.battery[:] = self._battery(k, step, stop)
+
+        row = int(np.searchsorted(self.stats_rows[:, 0], step, "right")) - 1 if len(self.stats_rows) else -1
+        if row >= 0:
+            self.stats_values = dict(zip(s.STATS_FIELDS, self.stats_rows[row, 2:].tolist()))
+        else:
+            self.stats_values = {field: 0 for field in s.STATS_FIELDS}
+        self.stats = s.format_stats(self.stats_values)
+        self.avg_battery = self.stats_values["avg_battery"]
+        self.steps = step
+        self.sim_time = step * self.TICK_MS
+        self.STOP_SIM = step >= self.last_step
+
+    def perform_actions(self):
+        """Advance the replay clock by one step; the store is updated by refresh()."""
+        if self.steps < self.last_step:
+            self.steps += 1
+        self.STOP_SIM = self.steps >= self.last_step
+
+    def refresh(self):
+        """Bring the store up to the replay clock."""
+        if self.steps != self.applied:
+            self.seek(self.steps)
+
+def attach(sim, sim_settings):
+    """
+    Record a trace of a simulation if its settings name a trace directory.
+
+    :param sim: Simulation to record.
+    :param sim_settings: SimulationSettings of the run.
+    :return: The attached TraceRecorder, or None when tracing is disabled.
+    """
+    path = sim_settings.get_trace()
+    if not path:
+        return None
+    recorder = TraceRecorder(path)
+    recorder.attach(sim)
+    return recorder
@@ -1,7 +1,10 @@
+import os
+import time
 import pygame as p
 from enum import Enum
 import menu
 import simulationInterface as interface
+import simulationSettings as settings
 
 # Enum representing different screen sizes
 class Size(Enum):
@@ -10,6 +13,20 @@ class Size(Enum):
     HEIGHT_SIM = 700 # Height for the simulation screen
     LENGTH_SIM = 1200 # Width for the simulation screen
 
+FPS = 60 # Fixed display frame rate
+
+def run_path(path, run_id):
+    """
+    Return the output file of one run: path with the run id added before its extension.
+
+    :param path: File given on the command line, or None.
+    :param run_id: Name of the run.
+    """
+    if path is None:
+        return None
+    stem, ext = os.path.splitext(path)
+    return f"{stem}_{run_id}{ext}"
+
 # Enum representing possible scenes/states of the game
 class Scene(Enum):
     MENU = 1 # Menu scene
@@ -19,14 +36,37 @@ class Game:
     """
     Main game class that handles scene management, event polling, and game loop.
     """
-    def __init__(self):
+    def __init__(self, worker=False, telemetry=None, telemetry_interval=0, topology_cache=None, trace=None, replay=None, world_size=640, seed=None):
         """
         Initializes the game by setting up the window and the initial scene.
+
+        :param worker: Run the simulation model in a separate process.
+        :param telemetry: Optional file name; every run writes its stats time series to a copy named after the run.
+        :param telemetry_interval: Minimum sim-time (ms) between telemetry rows.
+        :param topology_cache: Optional directory caching layouts of seeded runs.
+        :param trace: Optional directory; every run writes its binary event trace to a subdirectory named after the run.
+        :param replay: Optional trace directory played back right away instead of showing the menu.
+        :param world_size: Side of the simulated area in world units, unless a scenario sets it.
+        :param seed: Optional seed of every run started from the menu, unless a scenario sets one.
         """
         p.init()
+        self.worker = worker
+        self.telemetry = telemetry
+        self.telemetry_interval = telemetry_interval
+        self.topology_cache = topology_cache
+        self.trace = trace
+        self.world_size = world_size
+        self.seed = seed
+        self.session = time.strftime("%Y%m%d-%H%M%S") # Start of the game, names the output of its runs
+        self.runs = 0 # Simulations started so far
         self.screen = p.display.set_mode((Size.LENGTH_OPT.value, Size.HEIGHT_OPT.value))
         p.display.set_caption("Menu")
+        self.clock = p.time.Clock() # Limits the main loop to FPS frames per second
         self._init_scenes() # Set up initial scenes
+        if replay is not None:
+            replay_settings = settings.SimulationSettings()
+            replay_settings.set_replay(replay)
+            self.change_scene(Scene.SIMULATION, replay_settings)
 
     def _init_scenes(self):
         """
@@ -54,6 +94,15 @@ class Game:
             self.screen = p.display.set_mode((Size.LENGTH_SIM.value, Size.HEIGHT_SIM.value))
             p.display.set_caption("Simulation")
             # Lazy-load simulation interface when switching to simulation scene
+            simulation_settings.set_worker(self.worker)
+            self.runs += 1
+            run_id = f"{self.session}_run{self.runs}"
+            simulation_settings.set_telemetry(run_path(self.telemetry, run_id), self.telemetry_interval)
+            simulation_settings.set_topology_cache(self.topology_cache)
+            simulation_settings.set_trace(os.path.join(self.trace, run_id) if self.trace else None)
+            layout = simulation_settings.get_scenario()
+            if layout is None or layout.world_size is None:
+                simulation_settings.set_world_size(self.world_size)
             self.scenes[Scene.SIMULATION] = interface.SimulationInterface(self.screen, self, simulation_settings, Size.LENGTH_SIM.value, Size.HEIGHT_SIM.value)
 
         self.curr_scene = scene
@@ -73,4 +122,5 @@ class Game:
             self._poll_events() # Handle input/events
             self.scenes[self.curr_scene].render()
             self.scenes[self.curr_scene].update()
+            self.clock.tick(FPS)
     
\ No newline at end of file
@@ -0,0 +1,66 @@
+import argparse
+import time
+import eventSimulation as ev
+import scenario
+import simulationSettings as settings
+import telemetry
+import eventTrace
+
+def parse_args():
+    """Parse command line arguments of a headless run."""
+    parser = argparse.ArgumentParser(description="Run the WSN simulation without a display.")
+    parser.add_argument("sensors", type=int, nargs="?", help="number of sensors")
+    parser.add_argument("pois", type=int, nargs="?", help="number of POIs")
+    parser.add_argument("range", type=int, nargs="?", help="sensors range")
+    parser.add_argument("--scenario", default=None, help="JSON scenario file with the layout and parameters")
+    parser.add_argument("--steps", type=int, default=None, help="maximum number of simulation steps")
+    parser.add_argument("--seed", type=int, default=None, help="seed to reproduce a run")
+    parser.add_argument("--world-size", type=int, default=None, help="side of the simulated area in world units (default 640)")
+    parser.add_argument("--engine", choices=sorted(ev.ENGINES), default="frame", help="per-frame or discrete-event engine")
+    parser.add_argument("--fast-forward", action="store_true", help="skip idle stretches analytically between steps")
+    parser.add_argument("--topology-cache", default=None, help="directory caching layouts of seeded runs")
+    parser.add_argument("--trace", default=None, help="directory receiving a binary event trace for replay")
+    parser.add_argument("--telemetry", default=None, help="CSV or JSONL file receiving the stats of every step")
+    parser.add_argument("--telemetry-interval", type=int, default=0, help="minimum sim-time (ms) between telemetry rows")
+    args = parser.parse_args()
+    if args.scenario is None and None in (args.sensors, args.pois, args.range):
+        parser.error("sensors, pois and range are required without --scenario")
+    return args
+
+def main():
+    """Run a single simulation to completion and print its final statistics."""
+    args = parse_args()
+    sim_settings = settings.SimulationSettings()
+    if args.scenario is not None:
+        scenario.load(args.scenario).apply(sim_settings)
+    else:
+        sim_settings.set_snum(args.sensors)
+        sim_settings.set_pnum(args.pois)
+        sim_settings.set_srange(args.range)
+    if args.seed is not None or args.scenario is None:
+        sim_settings.set_seed(args.seed)
+    if args.world_size is not None:
+        sim_settings.set_world_size(args.world_size)
+    sim_settings.set_telemetry(args.telemetry, args.telemetry_interval)
+    sim_settings.set_topology_cache(args.topology_cache)
+    sim_settings.set_trace(args.trace)
+
+    sim = ev.ENGINES[args.engine](sim_settings)
+    writer = telemetry.attach(sim, sim_settings)
+    recorder = eventTrace.attach(sim, sim_settings)
+    start = time.perf_counter()
+    stats = sim.run(args.steps, args.fast_forward)
+    elapsed = time.perf_counter() - start
+    if writer is not None:
+        writer.close()
+    if recorder is not None:
+        recorder.close()
+
+    for line in stats:
+        print(line)
+    print(f"Seed: {sim.seed}")
+    print(f"Steps: {sim.steps} ({sim.sim_time / 1000:.1f} s of simulation time)")
+    print(f"Wall time: {elapsed:.2f} s ({sim.steps / max(elapsed, 1e-9):.0f} steps/s)")
+
+if __name__ == "__main__":
+    main()
@@ -1,108 +1,262 @@
+import numpy as np
 import pygame as p
 
+def minmax_downsample(values, buckets):
+    """
+    Pick the minimum and maximum sample of every bucket, keeping their order,
+    so peaks survive when many samples share one pixel column.
+
+    :param values: 1D array of samples.
+    :param buckets: Number of buckets (usually the plot width in pixels).
+    :return: Sorted array of indexes of the kept samples.
+    """
+    n = len(values)
+    if n <= 2 * buckets:
+        return np.arange(n)
+    size = -(-n // buckets) # ceil
+    full = n // size
+    # Equal buckets are a reshaped view; the shorter last bucket is handled on its own
+    blocks = values[:full * size].reshape(full, size)
+    offsets = np.arange(full) * size
+    low = offsets + blocks.argmin(axis=1)
+    high = offsets + blocks.argmax(axis=1)
+    if full * size < n:
+        tail = values[full * size:]
+        low = np.append(low, full * size + tail.argmin())
+        high = np.append(high, full * size + tail.argmax())
+    return np.stack([np.minimum(low, high), np.maximum(low, high)], axis=1).ravel()
+
+def lttb(values, threshold):
+    """
+    Largest-Triangle-Three-Buckets downsampling: from every bucket keep the sample forming
+    the largest triangle with the previously kept sample and the mean of the next bucket.
+
+    :param values: 1D array of samples, taken at equally spaced x.
+    :param threshold: Number of samples to keep.
+    :return: Sorted array of indexes of the kept samples.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    # Means of every bucket, used as the third triangle vertex of the previous bucket
+    sums = np.add.reduceat(values[1:n - 1].astype(np.float64), edges[:-1] - 1)
+    means_y = sums / np.diff(edges)
+    means_x = (edges[:-1] + edges[1:] - 1) / 2
+    kept = np.empty(threshold, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        if i + 1 < threshold - 2:
+            cx, cy = means_x[i + 1], means_y[i + 1]
+        else:
+            cx, cy = n - 1, values[n - 1]
+        xs = np.arange(start, stop)
+        area = np.abs((a - cx) * (values[start:stop] - values[a]) - (a - xs) * (cy - values[a]))
+        a = start + int(area.argmax())
+        kept[i + 1] = a
+    return kept
+
+class SeriesBuffer:
+    """
+    NumPy buffer of samples of several series taken at the same moments.
+    Every series is one contiguous row, so it can be downsampled without copying.
+    The capacity doubles when the buffer is full, so the full history is kept at amortized O(1) per sample.
+    """
+    def __init__(self, series_num, capacity=1024):
+        """
+        Initializes an empty buffer.
+
+        :param series_num: Number of series (columns).
+        :param capacity: Number of preallocated rows.
+        """
+        self.data = np.zeros((series_num, capacity), dtype=np.float32)
+        self.count = 0 # Number of samples appended
+
+    def __len__(self):
+        return self.count
+
+    def append(self, row):
+        """
+        Add one sample of every series.
+
+        :param row: Sequence with one value per series.
+        """
+        if self.count == self.data.shape[1]:
+            self.data = np.concatenate([self.data, np.zeros_like(self.data)], axis=1)
+        self.data[:, self.count] = row
+        self.count += 1
+
+    def last(self, n=None):
+        """
+        Return the most recent samples in chronological order.
+
+        :param n: Number of samples, all samples when None.
+        :return: 2D array (series, samples), a view into the buffer.
+        """
+        n = self.count if n is None else min(n, self.count)
+        return self.data[:, self.count - n:self.count]
+
 class LivePlot:
     """
     Class responsible for drawing a live-updating line plot in Pygame.
-    The plot visualizes changing values over time.
+    The plot visualizes several series changing over time: either the last `max_points`
+    samples or the whole run, downsampled to the plot width.
     """
-    def __init__(self, screen, rect, text, max_points=100, update_interval=500, color=(0, 0, 255)):
+    # Downsampling methods used for the full-history view
+    DOWNSAMPLE = {"minmax": lambda values, width: minmax_downsample(values, width),
+                  "lttb": lambda values, width: lttb(values, 2 * width)}
+
+    def __init__(self, screen, rect, text, max_points=100, update_interval=500, color=(0, 0, 255), series=None, downsample="minmax"):
         """
         Initializes the LivePlot instance.
 
         :param screen: Pygame surface to draw on
         :param rect: pygame.Rect defining the plot area (x, y, width, height)
         :param text: label text displayed above the plot
-        :param max_points: maximum number of points shown on the X-axis (buffer size)
+        :param max_points: maximum number of points shown on the X-axis in the recent view
         :param update_interval: time interval (in milliseconds) between data updates
-        :param color: line color of the plot
+        :param color: line color of the plot when it has a single default series
+        :param series: optional list of (name, label, color, max_val) tuples; max_val None scales to the largest value shown
+        :param downsample: 'minmax' or 'lttb', used for the full-history view
         """
         self.screen = screen
         self.rect = rect
         self.max_points = max_points
         self.update_interval = update_interval
-        self.color = color     
+        self.color = color
         self.step_x = self.rect.width / self.max_points  # X step between data points
+        self.series = series or [("value", None, color, 100)]
+        self.downsample = self.DOWNSAMPLE[downsample]
         self._init_var()
         self._init_colors()
         self._init_text(text)
 
     def _init_var(self):
         """Initializes internal variables and the data buffer."""
-        self.points = []  
+        self.buffer = SeriesBuffer(len(self.series)) # Full history of all series
+        self.values = [0.0] * len(self.series) # Latest value of every series
+        self.lines = None # Cached screen points of every series, rebuilt when data change
         self.last_update = p.time.get_ticks()
         self.min_val = 0
         self.max_val = 100
         self.paused = False # pause flag; when True, the plot does not update
-    
+        self.show_history = False # when True, the whole run is drawn instead of the last max_points
+
     def _init_colors(self):
         """Initializes additional colors."""
         self.GREY = (80,80,80)
 
     def _init_text(self, text):
+        """Render the title, the series legend and Y-axis labels once."""
         self.graph_text = p.font.SysFont('Tahoma', 15).render(text, True, self.GREY)
+        font = p.font.SysFont("Tahoma", 11)
+        self.grid_steps = 5
+        self.grid_labels = [font.render(f"{100 - (i * 100 // self.grid_steps)}%", True, self.GREY) for i in range(self.grid_steps + 1)]
+        self.legend = [font.render(label, True, color) for _, label, color, _ in self.series if label]
 
-    def add_value(self, val):
+    def add_value(self, values):
         """
-        Adds a new value to the plot, scaling it to fit the plot area.
+        Adds a new sample of every series to the plot.
 
-        :param val: new value to add (e.g., battery level, sensor reading)
+        :param values: dict series name -> value (series left out keep their last value),
+            or a single number for a plot with one series
         """
-         # Clamp and normalize value to plot height (Y axis is inverted in screen coordinates)
-        val_clamped = max(self.min_val, min(val, self.max_val))
-        norm_y = self.rect.bottom - ((val_clamped - self.min_val) / (self.max_val - self.min_val)) * self.rect.height
-
-        self.points.append(norm_y)
-        if len(self.points) > self.max_points:
-            self.points.pop(0)
+        if not isinstance(values, dict):
+            values = {self.series[0][0]: values}
+        for i, (name, _, _, _) in enumerate(self.series):
+            if name in values:
+                self.values[i] = values[name]
+        self.buffer.append(self.values)
+        self.lines = None
 
     def update(self, new_val=None):
         """
-        Updates the plot by adding a new value at regular time intervals.
+        Updates the plot by adding a new sample at regular time intervals.
 
-        :param new_val: new value to add, if available
+        :param new_val: new values to add (see add_value), if available
         """
         if self.paused:
             return  # Do not update if paused
-        
+
         now = p.time.get_ticks()
         if now - self.last_update >= self.update_interval:
             if new_val is not None:
                 self.add_value(new_val)
             self.last_update = now # Update timestamp
 
-    def draw(self):
+    def toggle_history(self):
+        """Switch between the recent window and the downsampled full history."""
+        self.show_history = not self.show_history
+        self.lines = None
+
+    def _build_lines(self):
         """
-        Draws the entire plot including background, grid, labels, and the data line.
+        Convert the visible samples of every series to screen points.
+
+        :return: List of (color, points) for series with at least two points.
+        """
+        lines = []
+        if self.show_history:
+            data = self.buffer.last()
+            span = max(data.shape[1] - 1, 1)
+        else:
+            data = self.buffer.last(self.max_points)
+        for i, (_, _, color, max_val) in enumerate(self.series):
+            values = data[i]
+            if self.show_history:
+                indexes = self.downsample(values, self.rect.width)
+                xs = self.rect.left + indexes * (self.rect.width / span)
+                values = values[indexes]
+            else:
+                xs = self.rect.left + np.arange(len(values)) * self.step_x
+            top = max_val if max_val is not None else max(float(values.max(initial=0)), 1.0)
+            # Clamp and normalize values to plot height (Y axis is inverted in screen coordinates)
+            scaled = (np.clip(values, self.min_val, top) - self.min_val) / (top - self.min_val)
+            ys = self.rect.bottom - scaled * self.rect.height
+            if len(xs) >= 2:
+                lines.append((color, np.column_stack([xs, ys]).tolist()))
+        return lines
+
+    def draw_static(self, surface):
+        """
+        Draws the parts of the plot that never change: background, title, legend, grid and labels.
+
+        :param surface: Surface to draw on (the screen or a cached static layer).
         """
         # Draw background
-        p.draw.rect(self.screen, (230, 230, 230), self.rect)
-        self.screen.blit(self.graph_text, (self.rect.x, self.rect.y - 17, self.rect.width, self.rect.height))
+        p.draw.rect(surface, (230, 230, 230), self.rect)
+        surface.blit(self.graph_text, (self.rect.x, self.rect.y - 17, self.rect.width, self.rect.height))
+
+        # Draw the series legend in one row above the title
+        x = self.rect.x
+        for label in self.legend:
+            surface.blit(label, (x, self.rect.y - 32))
+            x += label.get_width() + 10
 
         # Draw Y-axis labels and horizontal grid lines
-        font = p.font.SysFont("Tahoma", 11)
-        steps = 5
         label_margin = 5  # margin from the left side
-        for i in range(steps + 1):
-            percent = 100 - (i * 100 // steps)
-            y = self.rect.top + i * (self.rect.height // steps)
-            label = font.render(f"{percent}%", True, self.GREY)
-            
-            label_width = label.get_width()
-            label_x = self.rect.left - label_margin - label_width
-
-            self.screen.blit(label, (label_x, y - label.get_height() // 2))
+        for i, label in enumerate(self.grid_labels):
+            y = self.rect.top + i * (self.rect.height // self.grid_steps)
+            label_x = self.rect.left - label_margin - label.get_width()
+            surface.blit(label, (label_x, y - label.get_height() // 2))
 
             # Draw horizontal grid lines
-            p.draw.line(self.screen, (200, 200, 200), (self.rect.left, y), (self.rect.right, y), 1)
+            p.draw.line(surface, (200, 200, 200), (self.rect.left, y), (self.rect.right, y), 1)
 
+    def draw_line(self):
+        """
+        Draws only the data lines, on top of a previously drawn static part.
+        """
+        if self.lines is None:
+            self.lines = self._build_lines()
+        for color, points in self.lines:
+            p.draw.lines(self.screen, color, False, points, 2)
 
-        if len(self.points) < 2:
-            return
-
-        # Draw line plot by connecting points
-        points_to_draw = []
-        for i, y in enumerate(self.points):
-            x = self.rect.left + i * self.step_x
-            points_to_draw.append((x, y))
-
-        p.draw.lines(self.screen, self.color, False, points_to_draw, 2)
\ No newline at end of file
+    def draw(self):
+        """
+        Draws the entire plot including background, grid, labels, and the data line.
+        """
+        self.draw_static(self.screen)
+        self.draw_line()
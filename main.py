@@ -1,4 +1,16 @@
+import argparse
 import game
 
-g = game.Game()
-g.play()
\ No newline at end of file
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WSN simulation with a graphical interface.")
+    parser.add_argument("--worker", action="store_true", help="run the model in a separate process")
+    parser.add_argument("--telemetry", default=None, help="CSV or JSONL file name; each run writes the stats of every step to <name>_<start time>_run<N>.<ext>")
+    parser.add_argument("--telemetry-interval", type=int, default=0, help="minimum sim-time (ms) between telemetry rows")
+    parser.add_argument("--seed", type=int, default=None, help="seed of every run, so a layout repeats and can be cached")
+    parser.add_argument("--topology-cache", default=None, help="directory caching layouts of seeded runs (see --seed)")
+    parser.add_argument("--trace", default=None, help="directory; each run writes a binary event trace to <dir>/<start time>_run<N>")
+    parser.add_argument("--replay", default=None, help="trace directory of one run to play back instead of the menu")
+    parser.add_argument("--world-size", type=int, default=640, help="side of the simulated area in world units")
+    args = parser.parse_args()
+    g = game.Game(args.worker, args.telemetry, args.telemetry_interval, args.topology_cache, args.trace, args.replay, args.world_size, args.seed)
+    g.play()
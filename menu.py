@@ -2,6 +2,7 @@ import pygame as p
 import game
 import simulationSettings as settings
 import sliderDot as slider
+import scenario
 import tkinter
 import tkinter.filedialog
 
@@ -63,12 +64,17 @@ class Menu:
 
     def read_from_file(self):
         """
-        Reads simulation settings from a file.
+        Reads simulation settings from a file: a .txt line with the sensor count,
+        POI count and range, or a .json scenario (see scenario.Scenario).
         Returns True if successful, False otherwise.
         """
         file_name = self.prompt_file()
+        if file_name and file_name.endswith('.json'):
+            return self.read_scenario(file_name)
         if not file_name or not file_name.endswith('.txt'):
             return False
+        self.settings.set_scenario(None)
+        self.settings.set_seed(self.game.seed)
         
         try:
             with open(file_name, "r") as file:
@@ -93,6 +99,20 @@ class Menu:
         except (ValueError, OSError):
             return False
 
+    def read_scenario(self, file_name):
+        """
+        Loads a scenario file into the settings; a scenario without a seed takes the game's seed.
+        Returns True if successful, False otherwise.
+        """
+        try:
+            scenario.load(file_name).apply(self.settings)
+            if self.settings.get_seed() is None:
+                self.settings.set_seed(self.game.seed)
+            return True
+        except (ValueError, KeyError, TypeError, OSError) as error:
+            print(f"Invalid scenario file: {error}")
+            return False
+
     def handle_mouse_hovered(self):
         """Updates hover state and cursor when mouse hovers over buttons."""
         if self.generate_button.collidepoint(p.mouse.get_pos()): 
@@ -116,6 +136,8 @@ class Menu:
                 self.settings.set_snum(self.sliders["snum"].get_settings())
                 self.settings.set_pnum(self.sliders["pnum"].get_settings())
                 self.settings.set_srange(self.sliders["srange"].get_settings())
+                self.settings.set_scenario(None)
+                self.settings.set_seed(self.game.seed)
                 self.GEN_HOVERED = False
                 p.mouse.set_cursor(p.SYSTEM_CURSOR_ARROW)
                 self.game.change_scene(game.Scene.SIMULATION, self.settings)
@@ -0,0 +1,82 @@
+import numpy as np
+
+class PacketStore:
+    """
+    Append-only columnar storage of all data packets collected from POIs.
+    Packets are rows of preallocated typed columns; sensor buffers only hold
+    (start, stop) spans of rows, so forwarding moves spans instead of copying packets.
+    """
+    def __init__(self, capacity=1024):
+        """
+        Initializes an empty store.
+
+        :param capacity: Initial number of preallocated rows; grows geometrically.
+        """
+        self.size = 0
+        self._allocate(capacity)
+
+    def __len__(self):
+        return self.size
+
+    def _allocate(self, capacity):
+        """Allocate (or grow) all columns to the given capacity, keeping existing rows."""
+        columns = {
+            "temperature": np.float32,
+            "timestamp": np.int64, # Sim-time (ms) of the measurement
+            "poi_id": np.int32,
+        }
+        for name, dtype in columns.items():
+            column = np.empty(capacity, dtype=dtype)
+            if self.size:
+                column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def append(self, temperature, timestamp, poi_id):
+        """
+        Append a block of packets as contiguous rows.
+
+        :param temperature: Array of measured temperatures.
+        :param timestamp: Array of measurement times.
+        :param poi_id: Array of ids of the POIs the packets come from.
+        :return: Tuple (start, stop) of the appended rows.
+        """
+        count = len(temperature)
+        if self.size + count > self.capacity:
+            self._allocate(max(self.capacity * 2, self.size + count))
+        start = self.size
+        stop = start + count
+        self.temperature[start:stop] = temperature
+        self.timestamp[start:stop] = timestamp
+        self.poi_id[start:stop] = poi_id
+        self.size = stop
+        return start, stop
+
+def drop_front(spans, count):
+    """
+    Drop the first `count` packets from a list of spans.
+
+    :param spans: List of (start, stop) row ranges.
+    :param count: Number of packets to drop.
+    :return: New list of spans holding the remaining packets.
+    """
+    for i, (start, stop) in enumerate(spans):
+        if count < stop - start:
+            return [(start + count, stop)] + spans[i + 1:]
+        count -= stop - start
+    return []
+
+def extend_spans(target, spans):
+    """
+    Append spans to a buffer, merging a span that directly continues the last one.
+
+    :param target: List of (start, stop) row ranges that is extended in place.
+    :param spans: Spans to append.
+    """
+    for start, stop in spans:
+        if start == stop:
+            continue
+        if target and target[-1][1] == start:
+            target[-1] = (target[-1][0], stop)
+        else:
+            target.append((start, stop))
@@ -0,0 +1,107 @@
+import numpy as np
+import poi
+
+class PoiStore:
+    """
+    Struct-of-arrays storage of all POIs and of the measurements they have not released yet.
+    Pending measurements are kept per POI in small typed 2D columns, so one batched draw
+    generates data for every POI at once.
+    """
+    def __init__(self, capacity=16, pending_capacity=8):
+        """
+        Initializes an empty store.
+
+        :param capacity: Initial number of preallocated POI rows; grows as POIs are added.
+        :param pending_capacity: Initial number of pending measurements a POI can hold; grows when needed.
+        """
+        self.size = 0
+        self.views = [] # Poi view for every row
+        self.data_range = (15.0, 35.0) # Temperature range for simulated data
+        self.pending_capacity = pending_capacity
+        self._allocate(capacity)
+
+    def __len__(self):
+        return self.size
+
+    def _allocate(self, capacity):
+        """Allocate (or grow) all columns to the given capacity, keeping existing rows."""
+        columns = {
+            "x": (np.float64, 0),
+            "y": (np.float64, 0),
+            "reliability": (np.float32, 0),
+            "observer": (np.int32, -1), # Index of the sensor observing the POI, -1 if none
+            "pending": (np.int32, 0), # Number of measurements waiting to be released
+        }
+        for name, (dtype, fill) in columns.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            if self.size:
+                column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+
+        pending_temperature = np.zeros((capacity, self.pending_capacity), dtype=np.float32)
+        pending_timestamp = np.zeros((capacity, self.pending_capacity), dtype=np.int64)
+        if self.size:
+            pending_temperature[:self.size] = self.pending_temperature[:self.size]
+            pending_timestamp[:self.size] = self.pending_timestamp[:self.size]
+        self.pending_temperature = pending_temperature
+        self.pending_timestamp = pending_timestamp
+        self.capacity = capacity
+
+    def _grow_pending(self):
+        """Double the number of pending measurements every POI can hold."""
+        extra = self.pending_capacity
+        self.pending_temperature = np.concatenate([self.pending_temperature, np.zeros((self.capacity, extra), dtype=np.float32)], axis=1)
+        self.pending_timestamp = np.concatenate([self.pending_timestamp, np.zeros((self.capacity, extra), dtype=np.int64)], axis=1)
+        self.pending_capacity += extra
+
+    def add(self, coords, reliability):
+        """
+        Append a new POI row and return its view.
+
+        :param coords: Tuple (x, y) position in the simulation area.
+        :param reliability: Reliability score of the POI's measurements.
+        :return: Poi view over the new row.
+        """
+        if self.size == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.size
+        self.x[index], self.y[index] = coords
+        self.reliability[index] = reliability
+        self.size += 1
+        view = poi.Poi(self, index, coords)
+        self.views.append(view)
+        return view
+
+    def generate(self, prob, timestamp, rng):
+        """
+        Every POI generates one measurement with probability `prob`, using one batched draw.
+
+        :param prob: Float in [0, 1] indicating the chance of data generation.
+        :param timestamp: Simulation time (ms) stamped on the measurements.
+        :param rng: NumPy Generator used for the draws.
+        """
+        fired = np.flatnonzero(rng.random(self.size) < prob)
+        if not fired.size:
+            return
+        if self.pending[fired].max() >= self.pending_capacity:
+            self._grow_pending()
+        temperature = np.round(rng.uniform(*self.data_range, size=fired.size), 2)
+        slots = self.pending[fired]
+        self.pending_temperature[fired, slots] = temperature
+        self.pending_timestamp[fired, slots] = timestamp
+        self.pending[fired] += 1
+
+    def release(self, indexes):
+        """
+        Release all pending measurements of the given POIs and clear their buffers.
+
+        :param indexes: Array of POI rows, in the order their packets should appear.
+        :return: Tuple (temperature, timestamp, poi_id, counts) where counts holds the number of packets per POI.
+        """
+        counts = self.pending[indexes]
+        taken = np.arange(self.pending_capacity) < counts[:, None]
+        temperature = self.pending_temperature[indexes][taken]
+        timestamp = self.pending_timestamp[indexes][taken]
+        poi_id = np.repeat(indexes, counts).astype(np.int32)
+        self.pending[indexes] = 0
+        return temperature, timestamp, poi_id, counts
@@ -0,0 +1,204 @@
+import math as m
+import numpy as np
+
+class PointGrid:
+    """
+    Dense background grid of a point set whose points are at least `spacing` apart.
+    With cells of spacing / sqrt(2) every cell holds at most one point (as in Bridson's
+    Poisson-disk sampling), so minimum-distance tests of many candidates at once are a
+    fixed number of vectorized lookups instead of a scan over all points.
+    """
+    def __init__(self, bounds, spacing, reach=None):
+        """
+        Initializes an empty grid.
+
+        :param bounds: Tuple (x0, y0, x1, y1) of the area, inclusive.
+        :param spacing: Minimum distance between points stored in the grid.
+        :param reach: Largest distance conflicts() is queried with, `spacing` by default.
+        """
+        self.x0, self.y0, x1, y1 = bounds
+        self.cell = max(spacing, 1) / m.sqrt(2)
+        self.nx = int((x1 - self.x0) // self.cell) + 1
+        self.ny = int((y1 - self.y0) // self.cell) + 1
+        # Empty margin around the area, so neighbor cells of any cell can be read without bounds checks
+        self.margin = int(m.ceil(max(reach or 0, spacing, 1) / self.cell))
+        self.width = self.nx + 2 * self.margin
+        size = self.width * (self.ny + 2 * self.margin)
+        self.index = np.full(size, -1, dtype=np.int32) # Flat cell -> row in points, -1 if empty
+        self.scratch = np.full(size, -1, dtype=np.int32) # Reused by thin()
+        self.points = np.empty((0, 2))
+
+    def __len__(self):
+        return len(self.points)
+
+    def _cells(self, points):
+        """Return the flat cell of every point; points outside the area map to the nearest border cell."""
+        cx = np.clip(((points[:, 0] - self.x0) // self.cell).astype(np.int64), 0, self.nx - 1)
+        cy = np.clip(((points[:, 1] - self.y0) // self.cell).astype(np.int64), 0, self.ny - 1)
+        return (cy + self.margin) * self.width + cx + self.margin
+
+    def _offsets(self, dist):
+        """Return flat offsets of cells that can contain a point closer than `dist` to a point of the center cell."""
+        k = min(int(m.ceil(dist / self.cell)), self.margin)
+        offsets = []
+        for dy in range(-k, k + 1):
+            for dx in range(-k, k + 1):
+                gap_x = max(abs(dx) - 1, 0) * self.cell
+                gap_y = max(abs(dy) - 1, 0) * self.cell
+                if gap_x * gap_x + gap_y * gap_y < dist * dist:
+                    offsets.append((dx * dx + dy * dy, dy * self.width + dx))
+        # Nearest cells first: they are the most likely to reject a candidate early
+        return [offset for _, offset in sorted(offsets)]
+
+    def add(self, points):
+        """
+        Store points; they must keep the grid's spacing to each other and to stored points.
+
+        :param points: Array (n, 2) of coordinates.
+        """
+        if not len(points):
+            return
+        self.index[self._cells(points)] = np.arange(len(self.points), len(self.points) + len(points))
+        self.points = np.concatenate([self.points, points])
+
+    def conflicts(self, candidates, dist):
+        """
+        Return a mask of candidates closer than `dist` to any stored point.
+
+        :param candidates: Array (n, 2) of coordinates.
+        :param dist: Minimum allowed distance, at most the grid's reach.
+        """
+        hit = np.zeros(len(candidates), dtype=bool)
+        if not len(self.points) or not len(candidates) or dist <= 0:
+            return hit
+        cells = self._cells(candidates)
+        left = np.arange(len(candidates)) # Candidates without a conflict so far
+        for offset in self._offsets(dist):
+            found = self.index[cells[left] + offset]
+            has = found >= 0
+            delta = self.points[found[has]] - candidates[left[has]]
+            close = left[has][(delta * delta).sum(axis=1) < dist * dist]
+            if close.size:
+                hit[close] = True
+                left = left[~hit[left]]
+        return hit
+
+    def thin(self, candidates, dist):
+        """
+        Greedily keep candidates that are at least `dist` from every earlier kept candidate.
+        The result is not maximal (a candidate may be dropped for conflicting with one that
+        is dropped itself), which only costs another round of sampling.
+
+        :param candidates: Array (n, 2) of coordinates, in order of preference.
+        :param dist: Minimum distance between kept candidates, at least the grid spacing.
+        :return: Boolean mask of kept candidates.
+        """
+        keep = np.zeros(len(candidates), dtype=bool)
+        if not len(candidates):
+            return keep
+        cells = self._cells(candidates)
+        _, first = np.unique(cells, return_index=True)
+        keep[first] = True
+        self.scratch[cells[first]] = first
+        for offset in self._offsets(dist):
+            if offset == 0:
+                continue
+            found = self.scratch[cells[first] + offset]
+            earlier = np.flatnonzero((found >= 0) & (found < first))
+            delta = candidates[found[earlier]] - candidates[first[earlier]]
+            keep[first[earlier[(delta * delta).sum(axis=1) < dist * dist]]] = False
+        self.scratch[cells[first]] = -1
+        return keep
+
+def _valid(grid, candidates, min_dist, bounds, avoid):
+    """Return a mask of candidates inside the bounds and far enough from all stored and avoided points."""
+    x0, y0, x1, y1 = bounds
+    ok = (candidates[:, 0] >= x0) & (candidates[:, 0] <= x1) & (candidates[:, 1] >= y0) & (candidates[:, 1] <= y1)
+    ok &= ~grid.conflicts(candidates, min_dist)
+    for other, dist in avoid:
+        ok &= ~other.conflicts(candidates, dist)
+    return ok
+
+def sample(grid, count, min_dist, bounds, rng, avoid=(), rounds=32, k=30):
+    """
+    Add up to `count` uniformly distributed integer points at least `min_dist` apart to a grid.
+    Points are first thrown as vectorized batches of random darts; once darts are mostly
+    rejected (a dense area), the gaps are filled Bridson-style from annuli around existing points
+    until nothing fits. Both phases are bounded, so the call always terminates.
+
+    :param grid: PointGrid with spacing `min_dist` receiving the points (may already hold some).
+    :param count: Number of points wanted.
+    :param min_dist: Minimum distance between points.
+    :param bounds: Tuple (x0, y0, x1, y1) of the area, inclusive.
+    :param rng: NumPy Generator used for the draws.
+    :param avoid: Sequence of (PointGrid, distance) pairs the points must keep away from.
+    :param rounds: Maximum number of dart batches.
+    :param k: Candidates per active point in the Bridson phase.
+    :return: Array (n, 2) of the new points, n <= count.
+    """
+    x0, y0, x1, y1 = bounds
+    start = len(grid)
+    for _ in range(rounds):
+        need = count - (len(grid) - start)
+        if need <= 0:
+            break
+        batch = max(2 * need, 64)
+        darts = np.column_stack([rng.integers(x0, x1 + 1, batch), rng.integers(y0, y1 + 1, batch)]).astype(np.float64)
+        darts = darts[_valid(grid, darts, min_dist, bounds, avoid)]
+        darts = darts[grid.thin(darts, min_dist)][:need]
+        grid.add(darts)
+        if len(darts) < need / 8:
+            break # Mostly rejected: switch to filling gaps
+
+    # Bridson phase: grow from stored points while any of them has room around it
+    active = np.arange(len(grid))
+    while count - (len(grid) - start) > 0 and active.size:
+        need = count - (len(grid) - start)
+        angle = rng.uniform(0, 2 * m.pi, (active.size, k))
+        radius = rng.uniform(min_dist, 2 * min_dist, (active.size, k))
+        base = grid.points[active]
+        candidates = np.floor(np.stack([base[:, 0, None] + radius * np.cos(angle), base[:, 1, None] + radius * np.sin(angle)], axis=2))
+        ok = _valid(grid, candidates.reshape(-1, 2), min_dist, bounds, avoid).reshape(active.size, k)
+        found = ok.any(axis=1)
+        chosen = candidates[found, ok[found].argmax(axis=1)]
+        chosen = chosen[grid.thin(chosen, min_dist)][:need]
+        new = np.arange(len(grid), len(grid) + len(chosen))
+        grid.add(chosen)
+        active = np.concatenate([active[found], new])
+    return grid.points[start:]
+
+def sample_near(grid, anchors, inner, outer, min_dist, bounds, rng, avoid=(), attempts=1000, k=20):
+    """
+    Place one point near every anchor, at a distance drawn uniformly from [inner, outer],
+    at least `min_dist` from other points of the grid. Candidates for all anchors are drawn
+    together, `k` per anchor and round, up to `attempts` per anchor.
+
+    :param grid: PointGrid with spacing `min_dist` receiving the points.
+    :param anchors: Array (n, 2) of anchor coordinates.
+    :param inner: Minimum distance from the anchor.
+    :param outer: Maximum distance from the anchor.
+    :param min_dist: Minimum distance between points.
+    :param bounds: Tuple (x0, y0, x1, y1) of the area, inclusive.
+    :param rng: NumPy Generator used for the draws.
+    :param avoid: Sequence of (PointGrid, distance) pairs the points must keep away from.
+    :param attempts: Maximum number of candidates per anchor.
+    :param k: Candidates per anchor and round.
+    :return: Array (n, 2) of points, NaN rows for anchors that could not get one.
+    """
+    placed = np.full((len(anchors), 2), np.nan)
+    missing = np.arange(len(anchors))
+    for _ in range(m.ceil(attempts / k)):
+        if not missing.size:
+            break
+        angle = rng.uniform(0, 2 * m.pi, (missing.size, k))
+        radius = rng.uniform(inner, outer, (missing.size, k))
+        base = anchors[missing]
+        candidates = np.floor(np.stack([base[:, 0, None] + radius * np.cos(angle), base[:, 1, None] + radius * np.sin(angle)], axis=2))
+        ok = _valid(grid, candidates.reshape(-1, 2), min_dist, bounds, avoid).reshape(missing.size, k)
+        found = np.flatnonzero(ok.any(axis=1))
+        chosen = candidates[found, ok[found].argmax(axis=1)]
+        keep = grid.thin(chosen, min_dist)
+        grid.add(chosen[keep])
+        placed[missing[found[keep]]] = chosen[keep]
+        missing = np.flatnonzero(np.isnan(placed[:, 0]))
+    return placed
@@ -0,0 +1,108 @@
+import time
+import numpy as np
+
+class PhaseProfiler:
+    """
+    Lightweight per-phase timer with rolling sample windows.
+    Each phase keeps the durations of its last `window` samples in a ring buffer,
+    from which percentiles and histograms are computed on demand.
+    When disabled every call returns immediately, so it can stay in the hot path.
+    """
+    def __init__(self, window=512, enabled=False):
+        """
+        Initializes the profiler.
+
+        :param window: Number of most recent samples kept per phase.
+        :param enabled: Whether timings are recorded.
+        """
+        self.window = window
+        self.enabled = enabled
+        self.samples = {} # Phase name -> ring buffer of durations in seconds
+        self.counts = {} # Phase name -> number of recorded samples
+
+    def start(self):
+        """Return a start timestamp, or 0 when disabled."""
+        return time.perf_counter() if self.enabled else 0.0
+
+    def elapsed(self, start):
+        """Return seconds since `start`, or 0 when disabled."""
+        return time.perf_counter() - start if self.enabled else 0.0
+
+    def lap(self, name, start):
+        """
+        Record the time since `start` under `name` and return a new start timestamp.
+
+        :param name: Phase name.
+        :param start: Timestamp returned by start() or a previous lap().
+        """
+        if not self.enabled:
+            return 0.0
+        now = time.perf_counter()
+        self.record(name, now - start)
+        return now
+
+    def record(self, name, seconds):
+        """
+        Add one duration sample to a phase.
+
+        :param name: Phase name.
+        :param seconds: Duration in seconds.
+        """
+        if not self.enabled:
+            return
+        ring = self.samples.get(name)
+        if ring is None:
+            ring = self.samples[name] = np.zeros(self.window)
+            self.counts[name] = 0
+        ring[self.counts[name] % self.window] = seconds
+        self.counts[name] += 1
+
+    def _window(self, name):
+        """Return the recorded samples of a phase that are still in the window."""
+        ring = self.samples.get(name)
+        if ring is None:
+            return np.empty(0)
+        return ring[:min(self.counts[name], self.window)]
+
+    def percentile(self, name, q):
+        """
+        Return the q-th percentile of recent durations of a phase in milliseconds.
+
+        :param name: Phase name.
+        :param q: Percentile in [0, 100].
+        """
+        values = self._window(name)
+        return float(np.percentile(values, q)) * 1000 if values.size else 0.0
+
+    def histogram(self, name, bins=10):
+        """
+        Return a histogram of recent durations of a phase.
+
+        :param name: Phase name.
+        :param bins: Number of bins.
+        :return: Tuple (counts, bin edges in milliseconds).
+        """
+        counts, edges = np.histogram(self._window(name) * 1000, bins=bins)
+        return counts, edges
+
+    def summary(self):
+        """
+        Return p50, p99 and mean (in milliseconds) of every phase.
+
+        :return: Dict phase -> {"p50", "p99", "mean", "samples"}.
+        """
+        result = {}
+        for name in self.samples:
+            values = self._window(name)
+            result[name] = {
+                "p50": float(np.percentile(values, 50)) * 1000,
+                "p99": float(np.percentile(values, 99)) * 1000,
+                "mean": float(values.mean()) * 1000,
+                "samples": self.counts[name],
+            }
+        return result
+
+    def reset(self):
+        """Forget all recorded samples."""
+        self.samples.clear()
+        self.counts.clear()
@@ -0,0 +1,127 @@
+import pygame as p
+from collections import OrderedDict
+
+class TextCache:
+    """
+    Small LRU cache of fonts and rendered text surfaces.
+    Font lookup (p.font.SysFont) and text rendering are done once per distinct
+    (font, size, string, color) and reused on later frames.
+    """
+    def __init__(self, max_size=256):
+        """
+        Initializes an empty cache.
+
+        :param max_size: Maximum number of rendered surfaces kept.
+        """
+        self.max_size = max_size
+        self.fonts = {} # (name, size) -> pygame Font
+        self.surfaces = OrderedDict() # (name, size, text, color) -> rendered Surface
+
+    def font(self, name, size):
+        """
+        Return a cached system font.
+
+        :param name: Font family name.
+        :param size: Font size.
+        """
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            font = self.fonts[key] = p.font.SysFont(name, size)
+        return font
+
+    def render(self, name, size, text, color):
+        """
+        Return a rendered text surface, rendering it only on a cache miss.
+
+        :param name: Font family name.
+        :param size: Font size.
+        :param text: String to render.
+        :param color: RGB text color.
+        """
+        key = (name, size, text, color)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            return surface
+        surface = self.font(name, size).render(text, True, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_size:
+            self.surfaces.popitem(last=False)
+        return surface
+
+class StaticLayer:
+    """
+    Transparent full-screen surface holding everything that does not change between frames
+    (borders, legend, plot background and labels). It is drawn once and blitted every frame.
+    """
+    def __init__(self, size):
+        """
+        Initializes an empty transparent layer.
+
+        :param size: Tuple (width, height) of the screen.
+        """
+        self.surface = p.Surface(size, p.SRCALPHA)
+
+    def rebuild(self, draw_fn):
+        """
+        Clear the layer and redraw it with draw_fn(surface).
+
+        :param draw_fn: Callable drawing the static content onto the given surface.
+        """
+        self.surface.fill((0, 0, 0, 0))
+        draw_fn(self.surface)
+
+    def blit(self, screen):
+        """Draw the layer onto the screen."""
+        screen.blit(self.surface, (0, 0))
+
+class SpriteCache:
+    """
+    Small LRU cache of pre-rendered node shapes (dots, POIs, range circles).
+    Every distinct (color, size, width, border radius) is rasterised once onto a surface with an
+    RLE-accelerated colorkey, so blitting skips the transparent runs and even a large circle outline
+    is cheaper to blit than to rasterise; a whole layer of nodes then takes a single Surface.blits call.
+    """
+    def __init__(self, max_size=64, max_side=1024, max_pixels=4 * 1024 * 1024):
+        """
+        Initializes an empty cache.
+
+        :param max_size: Maximum number of sprites kept.
+        :param max_side: Largest sprite side in pixels; bigger shapes (only seen at a deep zoom) are not cached.
+        :param max_pixels: Maximum total area of the kept sprites, which bounds the memory taken by large circles.
+        """
+        self.max_size = max_size
+        self.max_side = max_side
+        self.max_pixels = max_pixels
+        self.pixels = 0 # Total area of the kept sprites
+        self.sprites = OrderedDict() # (color, size, width, border_radius) -> Surface
+
+    def get(self, color, size, width=0, border_radius=-1):
+        """
+        Return a sprite of a rounded rectangle, rendering it only on a cache miss.
+
+        :param color: RGB color.
+        :param size: Side of the shape in pixels.
+        :param width: Outline width, 0 for a filled shape.
+        :param border_radius: Corner radius as in pygame.draw.rect; the side gives a circle.
+        :return: Surface, or None if the shape is larger than max_side.
+        """
+        if size > self.max_side:
+            return None
+        key = (color, size, width, border_radius)
+        sprite = self.sprites.get(key)
+        if sprite is not None:
+            self.sprites.move_to_end(key)
+            return sprite
+        colorkey = tuple(255 - c for c in color) # Never equal to the shape color
+        sprite = p.Surface((size, size))
+        sprite.fill(colorkey)
+        sprite.set_colorkey(colorkey, p.RLEACCEL)
+        p.draw.rect(sprite, color, (0, 0, size, size), width, border_radius=border_radius)
+        self.sprites[key] = sprite
+        self.pixels += size * size
+        while len(self.sprites) > 1 and (len(self.sprites) > self.max_size or self.pixels > self.max_pixels):
+            _, old = self.sprites.popitem(last=False)
+            self.pixels -= old.get_width() * old.get_height()
+        return sprite
@@ -0,0 +1,33 @@
+import numpy as np
+
+class RngStreams:
+    """
+    Independent, seedable NumPy random generators of one simulation run.
+    Every source of randomness draws from its own stream, so changing how much one part
+    of the model consumes never shifts the numbers seen by another, and a run can be
+    replayed bit-for-bit from its seed.
+    """
+    # Names of the streams, each available as an attribute holding a numpy Generator
+    STREAMS = ("placement", "packets", "loss", "failures")
+
+    def __init__(self, seed=None):
+        """
+        Derive all streams from one root seed.
+
+        :param seed: Integer seed or None to draw fresh entropy from the OS.
+        """
+        root = np.random.SeedSequence(seed)
+        self.seed = root.entropy # Root seed; passing it back reproduces the run
+        for name, child in zip(self.STREAMS, root.spawn(len(self.STREAMS))):
+            setattr(self, name, np.random.default_rng(child))
+
+def spawn_seeds(seed, count):
+    """
+    Derive independent integer seeds, e.g. for parallel replications.
+
+    :param seed: Root integer seed or None for fresh entropy.
+    :param count: Number of seeds to derive.
+    :return: List of integer seeds.
+    """
+    root = np.random.SeedSequence(seed)
+    return [int(child.generate_state(2, np.uint64)[0]) for child in root.spawn(count)]
@@ -0,0 +1,173 @@
+import heapq
+from collections import deque
+import numpy as np
+
+class RoutingTree:
+    """
+    Reverse BFS tree of the sensor network rooted at the central node.
+    Every member node stores its parent (next hop towards the root) and hop count.
+    When nodes join or leave the network only the affected part of the tree is repaired.
+    Each node also counts the POI-observing nodes below it, which tells whether it relays for them.
+    """
+    def __init__(self, neighbors, root=0):
+        """
+        Initializes the routing tree.
+
+        :param neighbors: Sequence where neighbors[i] lists the node ids within link distance of node i.
+        :param root: Id of the central node, which is always a member of the tree.
+        """
+        self.neighbors = neighbors
+        self.root = root
+        self.size = len(neighbors)
+        self._init_var()
+
+    def _init_var(self):
+        """Initializes per-node routing state."""
+        self.member = np.ones(self.size, dtype=np.bool_) # Whether the node currently takes part in routing
+        self.parent = np.full(self.size, -1, dtype=np.int32) # Next hop towards the root, -1 if none
+        self.hops = np.full(self.size, -1, dtype=np.int32) # Hop count to the root, -1 if unreachable
+        self.children = [set() for _ in range(self.size)]
+        self.changed = set() # Nodes whose parent or hop count changed since last pop_changed()
+        self.observing = np.zeros(self.size, dtype=np.bool_) # Whether the node observes any POI
+        self.relay_count = np.zeros(self.size, dtype=np.int32) # Number of observing nodes in the subtree below the node
+
+    def build(self, members):
+        """
+        Build the whole tree from scratch with a single BFS from the root.
+
+        :param members: Iterable of booleans, True for nodes taking part in routing.
+        """
+        observing = self.observing
+        self._init_var()
+        self.member = np.fromiter(members, dtype=np.bool_, count=self.size)
+        self.member[self.root] = True
+        self.hops[self.root] = 0
+        # Restored before attaching so relay counts are accumulated while the tree grows
+        self.observing = observing
+        queue = deque([self.root])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.neighbors[current]:
+                if self.member[neighbor] and self.hops[neighbor] < 0:
+                    self._set_parent(neighbor, current, int(self.hops[current]) + 1)
+                    queue.append(neighbor)
+        self.changed = set(range(self.size))
+
+    def update(self, changes):
+        """
+        Apply membership changes and repair only the affected subtrees.
+
+        :param changes: Iterable of (node, is_member) pairs.
+        """
+        removed = []
+        added = []
+        for node, is_member in changes:
+            is_member = bool(is_member)
+            if node == self.root or self.member[node] == is_member:
+                continue
+            self.member[node] = is_member
+            (added if is_member else removed).append(node)
+
+        heap = []
+        # Detach subtrees hanging below removed nodes
+        orphans = []
+        for node in removed:
+            orphans.extend(self._detach_subtree(node))
+
+        # Orphans and newly joined nodes look for their best attached neighbor
+        for node in orphans + added:
+            if self.member[node] and self.hops[node] < 0:
+                self._push_best_parent(heap, node)
+        self._relax(heap)
+
+    def _detach_subtree(self, node):
+        """
+        Detach a node and all of its descendants from the tree.
+
+        :param node: Root of the subtree to detach.
+        :return: List of detached nodes.
+        """
+        detached = []
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            if self.hops[current] < 0:
+                continue
+            stack.extend(self.children[current])
+            self._set_parent(current, -1, -1)
+            detached.append(current)
+        return detached
+
+    def _push_best_parent(self, heap, node):
+        """Push the attached neighbor with the lowest hop count as a candidate parent of node."""
+        best = None
+        for neighbor in self.neighbors[node]:
+            if self.member[neighbor] and self.hops[neighbor] >= 0:
+                if best is None or self.hops[neighbor] < self.hops[best]:
+                    best = neighbor
+        if best is not None:
+            heapq.heappush(heap, (int(self.hops[best]) + 1, node, best))
+
+    def _relax(self, heap):
+        """
+        Dijkstra-style propagation of (hops, node, parent) candidates.
+        Attaches unreachable nodes and shortens routes where a better parent appeared.
+        """
+        while heap:
+            hops, node, parent = heapq.heappop(heap)
+            if not self.member[node] or (0 <= self.hops[node] <= hops):
+                continue
+            if self.hops[parent] != hops - 1:
+                continue # Parent moved since the candidate was pushed
+            self._set_parent(node, parent, hops)
+            for neighbor in self.neighbors[node]:
+                if neighbor == self.root or not self.member[neighbor]:
+                    continue
+                if self.hops[neighbor] < 0 or self.hops[neighbor] > hops + 1:
+                    heapq.heappush(heap, (hops + 1, neighbor, node))
+
+    def _set_parent(self, node, parent, hops):
+        """Update parent pointer, children sets, hop count and ancestors' relay counts of a node."""
+        old_parent = int(self.parent[node])
+        if old_parent != parent:
+            subtree_observing = int(self.relay_count[node]) + int(self.observing[node])
+            if old_parent >= 0:
+                self.children[old_parent].discard(node)
+                self._add_to_ancestors(old_parent, -subtree_observing)
+            if parent >= 0:
+                self.children[parent].add(node)
+                self._add_to_ancestors(parent, subtree_observing)
+        if old_parent != parent or self.hops[node] != hops:
+            self.changed.add(node)
+        self.parent[node] = parent
+        self.hops[node] = hops
+
+    def _add_to_ancestors(self, node, delta):
+        """Add delta to the relay count of node and all of its ancestors."""
+        if delta == 0:
+            return
+        while node >= 0:
+            self.relay_count[node] += delta
+            node = int(self.parent[node])
+
+    def set_observing(self, node, flag):
+        """
+        Mark whether a node observes any POI and update relay counts of its ancestors.
+
+        :param node: Node id.
+        :param flag: True if the node observes at least one POI.
+        """
+        if self.observing[node] == flag:
+            return
+        self.observing[node] = flag
+        self._add_to_ancestors(int(self.parent[node]), 1 if flag else -1)
+
+    def pop_changed(self):
+        """
+        Return and clear the set of nodes whose route changed.
+
+        :return: Set of node ids.
+        """
+        changed = self.changed
+        self.changed = set()
+        return changed
@@ -0,0 +1,176 @@
+import json
+import os
+import numpy as np
+
+# Parameters of Simulation._init_var a scenario may override
+ENERGY_FIELDS = ("prob_gen_packet", "min_packet_to_send", "battery_drain_idle", "battery_drain_send", "battery_drain_receive", "failure_prob")
+
+class Scenario:
+    """
+    Deployment described by a scenario file: a JSON header with the parameters of the run
+    and optional coordinate blocks with explicit sensor and POI positions.
+    Coordinates are world coordinates, relative to the top-left corner of the simulated area
+    whose side is "world_size" (640 when not given).
+
+    Example header:
+        {"sensors_range": 150, "seed": 7, "world_size": 2000,
+         "sensors": "sensors.npy", "pois": "pois.csv", "central": [320, 320],
+         "energy": {"battery_drain_idle": 0.01}}
+
+    "sensors" and "pois" are paths (relative to the header) of .npy or CSV blocks, or inline
+    lists of [x, y] rows; a POI row may carry its reliability as a third value. Without
+    coordinates, "sensors_num" and "poi_num" are placed randomly as with the sliders.
+    An optional "near_sensors" tells how many of the first sensors were placed next to a POI.
+    """
+    def __init__(self, sensors_range, sensors=None, pois=None, reliability=None, central=None, sensors_num=0, poi_num=0, seed=None, energy=None, world_size=None, near_sensors=0):
+        """
+        Initializes a scenario.
+
+        :param sensors_range: Range of all sensors.
+        :param sensors: Optional array (n, 2) of sensor positions, without the central node.
+        :param pois: Optional array (m, 2) of POI positions.
+        :param reliability: Optional array (m,) of POI reliabilities; random when None.
+        :param central: Optional (x, y) of the central node; the middle of the area when None.
+        :param sensors_num: Number of sensors (with the central node) placed randomly when sensors is None.
+        :param poi_num: Number of POIs placed randomly when pois is None.
+        :param seed: Optional seed of the run.
+        :param energy: Optional dict overriding ENERGY_FIELDS.
+        :param world_size: Optional side of the simulated area; the settings' default when None.
+        :param near_sensors: Number of leading entries of sensors that were placed next to a POI.
+        """
+        self.sensors_range = sensors_range
+        self.sensors = sensors
+        self.pois = pois
+        self.reliability = reliability
+        self.central = central
+        self.sensors_num = len(sensors) + 1 if sensors is not None else sensors_num
+        self.poi_num = len(pois) if pois is not None else poi_num
+        self.seed = seed
+        self.energy = energy or {}
+        self.world_size = world_size
+        self.near_sensors = near_sensors
+        unknown = set(self.energy) - set(ENERGY_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown energy parameters: {', '.join(sorted(unknown))}")
+
+    def fixes_layout(self):
+        """Return True if the scenario gives any coordinates or reliabilities, False if the whole layout is random."""
+        return any(value is not None for value in (self.sensors, self.pois, self.reliability, self.central))
+
+    def apply(self, sim_settings):
+        """
+        Put the scenario into simulation settings.
+
+        :param sim_settings: SimulationSettings to fill.
+        """
+        sim_settings.set_snum(self.sensors_num)
+        sim_settings.set_pnum(self.poi_num)
+        sim_settings.set_srange(self.sensors_range)
+        sim_settings.set_seed(self.seed)
+        if self.world_size is not None:
+            sim_settings.set_world_size(self.world_size)
+        sim_settings.set_scenario(self)
+
+def _read_block(value, base_dir, columns):
+    """
+    Read a coordinate block in one bulk operation.
+
+    :param value: Path of a .npy or CSV file, or an inline list of rows.
+    :param base_dir: Directory relative paths are resolved against.
+    :param columns: Accepted numbers of columns.
+    :return: 2D float array.
+    """
+    if isinstance(value, str):
+        path = os.path.join(base_dir, value)
+        if path.endswith(".npy"):
+            block = np.load(path)
+        else:
+            with open(path, "r") as file:
+                first = file.readline()
+            # Skip a header row such as "x,y"
+            skip = 0 if first.strip()[:1].lstrip("+-").replace(".", "").isdigit() else 1
+            block = np.loadtxt(path, delimiter=",", skiprows=skip, ndmin=2)
+    else:
+        block = np.array(value, dtype=np.float64, ndmin=2)
+    block = np.asarray(block, dtype=np.float64)
+    if block.size == 0:
+        return block.reshape(0, columns[0])
+    if block.ndim != 2 or block.shape[1] not in columns:
+        raise ValueError(f"Expected {' or '.join(map(str, columns))} columns, got shape {block.shape}")
+    return block
+
+def load(path):
+    """
+    Load a scenario file.
+
+    :param path: Path of the JSON header.
+    :return: Scenario.
+    :raises ValueError: If the file is not a valid scenario.
+    """
+    with open(path, "r") as file:
+        header = json.load(file)
+    if not isinstance(header, dict) or "sensors_range" not in header:
+        raise ValueError("A scenario needs at least 'sensors_range'.")
+    base_dir = os.path.dirname(os.path.abspath(path))
+    sensors = pois = reliability = None
+    if header.get("sensors") is not None:
+        sensors = _read_block(header["sensors"], base_dir, (2,))
+    if header.get("pois") is not None:
+        block = _read_block(header["pois"], base_dir, (2, 3))
+        pois = block[:, :2]
+        if block.shape[1] == 3:
+            reliability = block[:, 2]
+    central = header.get("central")
+    world_size = header.get("world_size")
+    return Scenario(
+        int(header["sensors_range"]), sensors, pois, reliability,
+        tuple(central) if central is not None else None,
+        int(header.get("sensors_num", 0)), int(header.get("poi_num", 0)),
+        header.get("seed"), header.get("energy"),
+        int(world_size) if world_size is not None else None,
+        int(header.get("near_sensors", 0)),
+    )
+
+def capture(sim):
+    """
+    Take the layout and parameters of a simulation as a scenario with inline coordinates.
+
+    :param sim: Simulation whose layout is taken.
+    :return: Scenario reproducing the deployment.
+    """
+    n = len(sim.store)
+    coords = np.column_stack([sim.store.x[:n], sim.store.y[:n]])
+    others = np.flatnonzero(~sim.store.is_central[:n])
+    m = len(sim.poi_store)
+    pois = np.column_stack([sim.poi_store.x[:m], sim.poi_store.y[:m]])
+    return Scenario(
+        sim.settings.get_srange(), coords[others], pois, sim.poi_store.reliability[:m].copy(),
+        tuple(coords[sim.central.index].tolist()), seed=sim.seed,
+        energy={field: getattr(sim, field) for field in ENERGY_FIELDS}, world_size=sim.WORLD_SIZE,
+        near_sensors=sim.near_sensors,
+    )
+
+def save(path, sim):
+    """
+    Write the layout and parameters of a simulation as a scenario, with .npy coordinate
+    blocks next to the header, so the same deployment can be loaded again.
+
+    :param path: Path of the JSON header.
+    :param sim: Simulation whose layout is saved.
+    """
+    stem = os.path.splitext(path)[0]
+    layout = capture(sim)
+    np.save(stem + "_sensors.npy", layout.sensors)
+    np.save(stem + "_pois.npy", np.column_stack([layout.pois, layout.reliability]))
+    header = {
+        "sensors_range": layout.sensors_range,
+        "seed": layout.seed,
+        "world_size": layout.world_size,
+        "central": list(layout.central),
+        "near_sensors": layout.near_sensors,
+        "sensors": os.path.basename(stem) + "_sensors.npy",
+        "pois": os.path.basename(stem) + "_pois.npy",
+        "energy": layout.energy,
+    }
+    with open(path, "w") as file:
+        json.dump(header, file, indent=2)
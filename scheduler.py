@@ -0,0 +1,72 @@
+import time
+
+class StepScheduler:
+    """
+    Fixed-timestep scheduler deciding how many simulation ticks run per displayed frame.
+    Real time elapsed between frames, multiplied by the selected speed, is accumulated and
+    consumed in whole TICK_MS steps; intermediate states are never drawn (frame skipping).
+    Ticks are capped by a per-frame time budget so the display keeps its frame rate.
+    """
+    # Selectable speeds as (label, multiplier); None runs as many ticks as fit in the budget
+    SPEEDS = (("1x", 1), ("10x", 10), ("100x", 100), ("max", None))
+
+    def __init__(self, tick_ms, fps=60, budget=0.8):
+        """
+        Initializes the scheduler at 1x speed.
+
+        :param tick_ms: Simulation time (ms) advanced by a single tick.
+        :param fps: Target display frame rate.
+        :param budget: Fraction of a frame that may be spent on simulation ticks.
+        """
+        self.tick_ms = tick_ms
+        self.frame_time = 1 / fps
+        self.budget = budget * self.frame_time
+        self.speed_index = 0
+        self.accumulator = 0.0 # Simulation milliseconds owed to the model
+        self.last_time = None
+        self.last_ticks = 0 # Ticks run during the last frame
+
+    def set_speed(self, index):
+        """
+        Select one of SPEEDS.
+
+        :param index: Index into SPEEDS.
+        """
+        self.speed_index = max(0, min(index, len(self.SPEEDS) - 1))
+        self.accumulator = 0.0
+
+    def get_speed_label(self):
+        """Return the label of the selected speed."""
+        return self.SPEEDS[self.speed_index][0]
+
+    def advance(self, sim):
+        """
+        Run the simulation ticks due for this frame.
+
+        :param sim: Simulation to step.
+        :return: Number of ticks performed.
+        """
+        now = time.perf_counter()
+        elapsed = self.frame_time if self.last_time is None else now - self.last_time
+        self.last_time = now
+        multiplier = self.SPEEDS[self.speed_index][1]
+
+        deadline = now + self.budget
+        ticks = 0
+        if multiplier is None:
+            # Max speed: fill the frame budget
+            while not sim.STOP_SIM and (ticks == 0 or time.perf_counter() < deadline):
+                sim.perform_actions()
+                ticks += 1
+        else:
+            self.accumulator += elapsed * 1000 * multiplier
+            while self.accumulator >= self.tick_ms and not sim.STOP_SIM:
+                sim.perform_actions()
+                ticks += 1
+                self.accumulator -= self.tick_ms
+                if time.perf_counter() >= deadline:
+                    # Too slow to keep up: drop the backlog instead of stalling the display
+                    self.accumulator = 0.0
+                    break
+        self.last_ticks = ticks
+        return ticks
@@ -0,0 +1,203 @@
+import numpy as np
+import sensor as s
+
+class SensorStore:
+    """
+    Struct-of-arrays storage of all sensor state.
+    Every sensor is a row in a set of NumPy arrays; Sensor objects are thin views over one row,
+    so the simulation step can update the whole network with vectorized operations.
+    State, battery and packet changes go through the store's methods, which keep running
+    network counters, so statistics never need a pass over all sensors.
+    """
+    def __init__(self, max_battery=100, capacity=64):
+        """
+        Initializes an empty store.
+
+        :param max_battery: Battery level of a fully charged sensor.
+        :param capacity: Initial number of preallocated rows; grows as sensors are added.
+        """
+        self.max_battery = max_battery
+        self.size = 0
+        self.views = [] # Sensor view for every row
+        self.visible = {} # Row -> set of POIs observed by the sensor
+        self.buffers = [] # Row -> list of (start, stop) PacketStore spans held by the sensor
+        self.on_state_change = None # Optional callback(indexes, old_states, new_state)
+        self.on_battery_set = None # Optional callback(index, value) for explicit battery changes (not drain)
+        self.state_counts = np.zeros(len(s.State) + 1, dtype=np.int64) # Number of sensors in every state
+        self.active_battery = 0.0 # Sum of battery levels of active sensors
+        self.total_packets = 0 # Packets held by all sensors, including the central one
+        self.total_lost = 0 # Packets lost on all links
+        self._allocate(capacity)
+
+    def __len__(self):
+        return self.size
+
+    def _allocate(self, capacity):
+        """Allocate (or grow) all columns to the given capacity, keeping existing rows."""
+        columns = {
+            "x": (np.float64, 0),
+            "y": (np.float64, 0),
+            "radius": (np.int32, 0),
+            "battery": (np.float64, self.max_battery),
+            "state": (np.int8, s.State.ACTIVE.value),
+            "is_central": (np.bool_, False),
+            "next_hop": (np.int32, -1),
+            "in_path": (np.bool_, True),
+            "packets": (np.int64, 0), # Number of packets held by the sensor
+            "lost_packets": (np.int64, 0),
+            "last_collect": (np.int64, 0), # Sim-time of the last POI collection
+        }
+        for name, (dtype, fill) in columns.items():
+            column = np.full(capacity, fill, dtype=dtype)
+            if self.size:
+                column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+        self.capacity = capacity
+
+    def add(self, coords, radius, central=False):
+        """
+        Append a new sensor row and return its view.
+
+        :param coords: Tuple (x, y) position in the simulation area.
+        :param radius: Radius of the sensing area.
+        :param central: Boolean flag for central/base station node.
+        :return: Sensor view over the new row.
+        """
+        if self.size == self.capacity:
+            self._allocate(self.capacity * 2)
+        index = self.size
+        self.x[index], self.y[index] = coords
+        self.radius[index] = radius
+        self.is_central[index] = central
+        self.state_counts[self.state[index]] += 1
+        if self.state[index] == s.State.ACTIVE.value:
+            self.active_battery += self.battery[index]
+        self.size += 1
+        self.buffers.append([])
+        view = s.Sensor(self, index, coords)
+        self.views.append(view)
+        return view
+
+    def add_many(self, coords, radius):
+        """
+        Append many non-central sensors at once and return their views.
+
+        :param coords: Array (n, 2) of integer positions.
+        :param radius: Radius of the sensing area of all new sensors.
+        :return: List of Sensor views over the new rows.
+        """
+        count = len(coords)
+        if not count:
+            return []
+        if self.size + count > self.capacity:
+            self._allocate(max(self.capacity * 2, self.size + count))
+        start, stop = self.size, self.size + count
+        self.x[start:stop] = coords[:, 0]
+        self.y[start:stop] = coords[:, 1]
+        self.radius[start:stop] = radius
+        self.state_counts += np.bincount(self.state[start:stop], minlength=len(self.state_counts))
+        active = self.state[start:stop] == s.State.ACTIVE.value
+        self.active_battery += float(self.battery[start:stop][active].sum())
+        self.size = stop
+        self.buffers.extend([] for _ in range(count))
+        views = [s.Sensor(self, index, xy) for index, xy in zip(range(start, stop), map(tuple, coords.tolist()))]
+        self.views.extend(views)
+        return views
+
+    def trim(self):
+        """Shrink all columns to the number of sensors once placement is finished."""
+        self._allocate(self.size)
+
+    def set_state(self, index, state):
+        """
+        Single transition point for the state of one sensor.
+
+        :param index: Row of the sensor.
+        :param state: New State of the sensor.
+        """
+        if self.state[index] == state.value:
+            return
+        old_state = self.state[index]
+        self.state[index] = state.value
+        self.state_counts[old_state] -= 1
+        self.state_counts[state.value] += 1
+        if old_state == s.State.ACTIVE.value:
+            self.active_battery -= self.battery[index]
+        elif state == s.State.ACTIVE:
+            self.active_battery += self.battery[index]
+        if self.on_state_change is not None:
+            self.on_state_change(np.array([index]), np.array([old_state], dtype=np.int8), state.value)
+
+    def set_states(self, indexes, state):
+        """
+        Bulk transition point: move all given sensors to the same state.
+        Only rows whose state actually changes are reported to on_state_change.
+
+        :param indexes: Array of rows.
+        :param state: New State of the sensors.
+        """
+        indexes = np.asarray(indexes)
+        old_states = self.state[indexes]
+        changed = old_states != state.value
+        if not changed.any():
+            return
+        indexes = indexes[changed]
+        old_states = old_states[changed]
+        self.state[indexes] = state.value
+        self.state_counts -= np.bincount(old_states, minlength=len(self.state_counts))
+        self.state_counts[state.value] += len(indexes)
+        if state == s.State.ACTIVE:
+            self.active_battery += float(self.battery[indexes].sum())
+        else:
+            self.active_battery -= float(self.battery[indexes[old_states == s.State.ACTIVE.value]].sum())
+        if self.on_state_change is not None:
+            self.on_state_change(indexes, old_states, state.value)
+
+    def set_battery(self, index, value):
+        """
+        Set the battery level of one sensor.
+
+        :param index: Row of the sensor.
+        :param value: New battery level.
+        """
+        if self.state[index] == s.State.ACTIVE.value:
+            self.active_battery += value - self.battery[index]
+        self.battery[index] = value
+        if self.on_battery_set is not None:
+            self.on_battery_set(index, value)
+
+    def drain(self, indexes, amount):
+        """
+        Lower the battery of the given sensors.
+
+        :param indexes: Array of rows; a row listed k times is drained k times.
+        :param amount: Energy taken for every occurrence of a row.
+        """
+        np.subtract.at(self.battery, indexes, amount)
+        self.active_battery -= amount * np.count_nonzero(self.state[indexes] == s.State.ACTIVE.value)
+
+    def add_packets(self, indexes, counts):
+        """
+        Add newly collected packets to the buffers' counters of the given sensors.
+
+        :param indexes: Array of unique rows.
+        :param counts: Array with the number of packets of every row.
+        """
+        self.packets[indexes] += counts
+        self.total_packets += int(counts.sum())
+
+    def move_packets(self, senders, hops, lost):
+        """
+        Move all packets of the senders to their next hops, minus the lost ones.
+
+        :param senders: Array of unique rows sending their whole buffer.
+        :param hops: Array with the receiving row of every sender.
+        :param lost: Array with the number of packets every sender loses.
+        """
+        totals = self.packets[senders]
+        self.packets[senders] = 0
+        np.add.at(self.packets, hops, totals - lost)
+        np.add.at(self.lost_packets, senders, lost)
+        lost_sum = int(lost.sum())
+        self.total_packets -= lost_sum
+        self.total_lost += lost_sum
@@ -1,78 +1,160 @@
-import pygame as p
+import numpy as np
 import sensor as s
-import random as r
-import poi
+import sensorStore as store
+import poiStore
+import packetStore
+import rngStreams
+import profiler
 import math as m
-import liveGraph as graph
+import routing
+import poissonDisk
+import topology
+
+# Keys of Simulation.stats_values, in the order of the stats lines
+STATS_FIELDS = ("avg_battery", "active", "sleeping", "dead", "packets", "delivered", "lost", "failed")
+
+def format_stats(values):
+    """
+    Build the human-readable stats lines from numeric stats values.
+
+    :param values: Dict with the STATS_FIELDS keys.
+    :return: List of strings.
+    """
+    return [
+        f"Average battery level: {values['avg_battery']:.1f}%",
+        f"Active sensors: {int(values['active'])}",
+        f"Sleeping sensors: {int(values['sleeping'])}",
+        f"Dead sensors: {int(values['dead'])}",
+        f"Packets in the network: {int(values['packets'])}",
+        f"Packets at the central node: {int(values['delivered'])}",
+        f"Lost packets: {int(values['lost'])}",
+        f"Failed sensors: {int(values['failed'])}",
+    ]
 
 class Simulation:
-    def __init__(self, screen, settings, width, height, sim_size, dist):
+    """
+    Headless WSN model advanced by a logical simulation clock.
+    It holds no reference to pygame; any renderer (e.g. SimulationInterface)
+    only reads its sensors, POIs and stats.
+    """
+    def __init__(self, settings, tick_ms=16):
         """
         Initialize the simulation environment.
+        All positions are world coordinates in a square area of settings.get_world_size() units
+        with the origin in its top-left corner; mapping them to the screen is up to the renderer.
 
-        :param screen: pygame Surface to draw on.
         :param settings: Simulation settings/configuration object.
-        :param width: Width of the window.
-        :param height: Height of the window.
-        :param sim_size: Size (width and height) of the simulation area.
-        :param dist: Distance from edges of the window to the simulation area.
-        """
-        self.SIM_SIZE = sim_size
-        self.DIST_FROM_EDGE = dist
-        self.screen = screen
+        :param tick_ms: Simulation time (ms) advanced by a single step.
+        """
         self.settings = settings
-        self.SCREEN_WIDTH = width
-        self.SCREEN_HEIGHT = height
+        self.TICK_MS = tick_ms
 
         self._init_consts()
         self._init_var()
-        self._init_pois_coords()
-        self._init_sensors_coords()
-        # Initialize live plot for sensor activity visualization
-        self.live_plot = graph.LivePlot(self.screen,p.Rect(50, 520, 400, 150), "Sensor activity over time", max_points=80)
-        self.create_stats() # Initialize simulation statistics display
+        cached = self._load_topology()
+        if not cached:
+            self._init_pois_coords()
+            self._init_sensors_coords()
+        self._init_routing()
+        if not cached:
+            self._save_topology()
+        self.create_stats() # Initialize simulation statistics
 
 
     def _init_consts(self):
         """
         Initialize constants and main attributes used throughout the simulation.
         """
-        self.SIM_WIN_X = self.SCREEN_WIDTH - self.SIM_SIZE - self.DIST_FROM_EDGE
-        self.SIM_WIN_Y = self.SCREEN_HEIGHT - self.SIM_SIZE - self.DIST_FROM_EDGE
+        self.WORLD_SIZE = self.settings.get_world_size() # Width and height of the simulated area in world units
         self.MIN_DIST_SENSORS = 7
         self.MIN_DIST_POI_FROM_SENSOR = 20
         self.MIN_DIST_POIS = self.settings.get_srange() / 3
-        self.sensors = [] # List containing all sensor objects
-        self.pois = [] # List containing all POI objects
+        self.placement_bounds = (0, 0, self.WORLD_SIZE, self.WORLD_SIZE)
+        self.central_coords = (self.WORLD_SIZE // 2, self.WORLD_SIZE // 2)
+        self.scenario = self.settings.get_scenario() # Explicit layout and parameters loaded from a file, if any
+        if self.scenario is not None and self.scenario.central is not None:
+            self.central_coords = tuple(int(round(c)) for c in self._from_scenario(np.array([self.scenario.central]))[0])
+        self.store = store.SensorStore() # Array-backed state of all sensors
+        self.store.on_state_change = self._on_sensor_state_change
+        self.sensors = self.store.views # List containing all sensor views
+        self.state_changes = [] # Indexes of sensors that changed state since the last routing update
+        self.poi_store = poiStore.PoiStore() # Array-backed state of all POIs and their pending measurements
+        self.pois = self.poi_store.views # List containing all POI views
+        self.packets = packetStore.PacketStore() # Columnar storage of all collected packets
+        self.unobserved_pois = set() # POIs no sensor is observing at the moment
+        self.near_sensors = 0 # Sensors after the central node that were placed next to a POI
+        self.topology = None # Static graph of the placed network, built in _init_routing or loaded from the cache
         self.STOP_SIM = False # Flag to stop simulation when conditions are met
+        self.GEN_PACKET_INTERVAL = 1000 # Sim-time (ms) between packet generation rounds in POIs
+        self.COLLECT_INTERVAL = 5000 # Sim-time (ms) between collections of POI data by a sensor
 
     def _init_var(self):
         """
         Initialize runtime parameters and variables controlling sensor behavior.
         """
+        self.sim_time = 0 # Logical simulation clock in milliseconds
+        self.steps = 0 # Number of performed simulation steps
+        self.avg_battery = 0
+        self.stats_values = {} # Numeric values behind the stats lines
+        self.stats_listeners = [] # Callbacks receiving stats_values after every update
         self.last_gen_packet_time = 0
         self.prob_gen_packet = 0.7
         self.min_packet_to_send = 10
         self.battery_drain_idle = 0.02
         self.battery_drain_send = 2
         self.battery_drain_receive = 6
+        self.failure_prob = 0.00001 # Probability of a random failure of each active sensor per step
+        self.due_failures = None # Sensors a fast-forward found to fail on the next step, None to draw per step
+        self.trace = None # Optional recorder of state and route changes (eventTrace.TraceRecorder)
+        if self.scenario is not None:
+            for field, value in self.scenario.energy.items():
+                setattr(self, field, value)
+        # Independent random streams (placement, packets, loss, failures) derived from the settings' seed
+        self.rng = rngStreams.RngStreams(self.settings.get_seed())
+        self.seed = self.rng.seed
+        self.profiler = profiler.PhaseProfiler() # Per-phase step timings, disabled by default
+
+    def _add_sensor(self, coords, radius, central=False):
+        """
+        Add a sensor to the store.
 
-    # spr czy odlelgosc od elementow jest odpowiednia
-    def is_far_enough(self, new_x: int, new_y: int, min_dist: int, tab):
+        :param coords: Tuple (x, y) position of the sensor.
+        :param radius: Radius of the sensing area.
+        :param central: Boolean flag for central/base station node.
+        :return: Sensor view of the new sensor.
         """
-        Check if the point (new_x, new_y) is at least min_dist away from all elements in tab.
+        return self.store.add(coords, radius, central)
 
-        :param new_x: X coordinate of the new point.
-        :param new_y: Y coordinate of the new point.
-        :param min_dist: Minimum required distance from other elements.
-        :param tab: List of objects that have get_coords() method returning (x, y).
-        :return: True if new point is far enough from all elements, False otherwise.
+    def _from_scenario(self, coords):
         """
-        for elem in tab:
-            x, y = elem.get_coords()
-            if m.hypot(new_x - x, new_y - y) < min_dist:
-                return False
-        return True
+        Round scenario coordinates to integer world positions.
+
+        :param coords: Array (n, 2) of scenario coordinates.
+        :return: Array (n, 2) of int64 positions.
+        """
+        return np.rint(coords).astype(np.int64)
+
+    def _add_sensors(self, coords, radius):
+        """
+        Add many non-central sensors to the store at once.
+
+        :param coords: Array (n, 2) of integer positions.
+        :param radius: Radius of the sensing area.
+        """
+        self.store.add_many(coords, radius)
+
+    def _on_sensor_state_change(self, indexes, old_states, new_state):
+        """
+        Record sensor state transitions so routing can be repaired on the next step,
+        and in the event trace when one is recorded.
+
+        :param indexes: Array of sensors that changed state.
+        :param old_states: Array of their previous state values.
+        :param new_state: New state value.
+        """
+        self.state_changes.extend(indexes.tolist())
+        if self.trace is not None:
+            self.trace.record_states(indexes, new_state)
 
     def _init_sensors_coords(self):
         """
@@ -81,162 +163,239 @@ class Simulation:
         - One sensor placed near each POI.
         - Remaining sensors placed randomly within simulation window,
           respecting minimum distance constraints.
+        All non-central sensors are drawn by Poisson-disk sampling on a dense grid, so the
+        number of attempts is bounded and large networks are laid out in vectorized rounds.
+        Sensors listed in a scenario are taken as given instead.
         """
-        # Place central sensor in the middle of simulation window
-        self.sensors.append(s.Sensor((self.SIM_WIN_X + self.SIM_SIZE // 2, self.SIM_WIN_Y + self.SIM_SIZE // 2), self.settings.get_srange(), self.screen, True))
-        self.central = self.sensors[0]
         sensor_range = self.settings.get_srange()
-        num_sensors = self.settings.get_snum()
-        max_attempts = 1000
-
-        # 1. Place one sensor near each POI (within 80% of sensor range)
-        for poi_obj in self.pois:
-            placed = False
-            for _ in range(max_attempts):
-                angle = r.uniform(0, 2 * m.pi)
-                radius = r.uniform(0, sensor_range * 0.8)
-                x_offset = int(poi_obj.get_coords()[0] + radius * m.cos(angle))
-                y_offset = int(poi_obj.get_coords()[1] + radius * m.sin(angle))
-
-                if self.is_far_enough(x_offset, y_offset, self.MIN_DIST_SENSORS, self.sensors):
-                    sensor = s.Sensor((x_offset, y_offset), sensor_range, self.screen)
-                    self.sensors.append(sensor)
-                    placed = True
-                    break
-            if not placed:
-                print("Nie udało się umieścić sensora przy POI.")
+        placement = self.rng.placement
+
+        # Place central sensor in the middle of simulation window
+        self.central = self._add_sensor(self.central_coords, sensor_range, True)
+        if self.scenario is not None and self.scenario.sensors is not None:
+            self._add_sensors(self._from_scenario(self.scenario.sensors), sensor_range)
+            self.store.trim()
+            self.near_sensors = min(self.scenario.near_sensors, len(self.scenario.sensors))
+            return
+
+        sensors = poissonDisk.PointGrid(self.placement_bounds, self.MIN_DIST_SENSORS)
+        sensors.add(np.array([self.central_coords], dtype=np.float64))
+        avoid = [(self.poi_points, self.MIN_DIST_POI_FROM_SENSOR)]
+
+        # 1. Place one sensor near each POI (within 80% of sensor range, outside the POI's own clearance)
+        outer = sensor_range * 0.8
+        inner = min(self.MIN_DIST_POI_FROM_SENSOR, outer)
+        near = poissonDisk.sample_near(sensors, self.poi_points.points, inner, outer, self.MIN_DIST_SENSORS, self.placement_bounds, placement, avoid)
+        placed = ~np.isnan(near[:, 0])
+        for _ in range(int((~placed).sum())):
+            print("Nie udało się umieścić sensora przy POI.")
+        self._add_sensors(near[placed].astype(np.int64), sensor_range)
+        self.near_sensors = int(placed.sum())
 
         # 2. Place remaining sensors randomly in the simulation area
-        remaining = num_sensors - len(self.sensors)
-        for _ in range(remaining):
-            for _ in range(max_attempts):
-                x = r.randint(self.SIM_WIN_X, self.SIM_WIN_X + self.SIM_SIZE)
-                y = r.randint(self.SIM_WIN_Y, self.SIM_WIN_Y + self.SIM_SIZE)
-                if self.is_far_enough(x, y, self.MIN_DIST_SENSORS, self.sensors):
-                    self.sensors.append(s.Sensor((x, y), self.settings.get_srange(), self.screen))
-                    break
+        remaining = self.settings.get_snum() - len(self.sensors)
+        rest = poissonDisk.sample(sensors, remaining, self.MIN_DIST_SENSORS, self.placement_bounds, placement, avoid)
+        self._add_sensors(rest.astype(np.int64), sensor_range)
+        self.store.trim()
 
     def _init_pois_coords(self):
         """
         Initialize POI positions randomly inside the simulation window,
-        respecting minimum distance constraints between POIs and sensors.
-        """
-        max_attempts = 1000
-        for _ in range(self.settings.get_pnum()):
-            for _ in range(max_attempts):
-                x = r.randint(self.SIM_WIN_X, self.SIM_WIN_X + self.SIM_SIZE)
-                y = r.randint(self.SIM_WIN_Y, self.SIM_WIN_Y + self.SIM_SIZE)
-                if self.is_far_enough(x, y, self.MIN_DIST_POIS, self.pois) and self.is_far_enough(x, y, self.MIN_DIST_POI_FROM_SENSOR, self.sensors):
-                    self.pois.append(poi.Poi((x, y), self.screen))
-                    break
+        respecting minimum distance constraints between POIs and from the central sensor.
+        POIs listed in a scenario are taken as given instead.
+        """
+        placement = self.rng.placement
+        self.poi_points = poissonDisk.PointGrid(self.placement_bounds, self.MIN_DIST_POIS, self.MIN_DIST_POI_FROM_SENSOR)
+        if self.scenario is not None and self.scenario.pois is not None:
+            coords = self._from_scenario(self.scenario.pois)
+            self.poi_points.add(coords.astype(np.float64))
+        else:
+            central = poissonDisk.PointGrid(self.placement_bounds, self.MIN_DIST_POI_FROM_SENSOR)
+            central.add(np.array([self.central_coords], dtype=np.float64))
+            coords = poissonDisk.sample(self.poi_points, self.settings.get_pnum(), self.MIN_DIST_POIS, self.placement_bounds, placement, [(central, self.MIN_DIST_POI_FROM_SENSOR)])
+        if self.scenario is not None and self.scenario.reliability is not None:
+            reliability = self.scenario.reliability
+        else:
+            reliability = placement.uniform(0.8, 1.0, len(coords)) # Random reliability between 0.8 and 1.0
+        self._add_pois(coords, reliability)
+
+    def _add_pois(self, coords, reliability):
+        """
+        Add POIs to the store.
 
-    def find_path_to_central(self):
+        :param coords: Array (n, 2) of integer positions.
+        :param reliability: Array (n,) of reliabilities.
         """
-        For each sensor that is active or sleeping, compute a path to the central sensor.
-        The path is built based on sensor proximity (edges between sensors within half their radius).
-        Sensors outside of communication range have no path (None).
-        """
-        sensor_graph = {}
-
-        # Only consider active or sleeping sensors for graph edges
-        active_sensors = [se for se in self.sensors if se.state == s.State.ACTIVE or se.state == s.State.SLEEP]
-
-        # Ensure central sensor is included in graph
-        if self.central not in active_sensors:
-            active_sensors.append(self.central)
-
-        # Build adjacency list for sensor graph
-        for sensor in active_sensors:
-            sensor_graph[sensor] = []
-            for other in active_sensors:
-                if sensor == other:
-                    continue
-                x1, y1 = sensor.get_coords()
-                x2, y2 = other.get_coords()
-                dist = m.hypot(x1 - x2, y1 - y2)
-                if dist <= sensor.radius / 2:
-                    sensor_graph[sensor].append(other)
-
-        self.paths_to_central = {}
-
-        # BFS to find shortest path from each sensor to central sensor
-        for sensor in self.sensors:
-            if sensor not in sensor_graph:
-                self.paths_to_central[sensor] = None
-                sensor.in_path = False
-                continue
-
-            if sensor == self.central:
-                self.paths_to_central[sensor] = [self.central]
-                sensor.next_hop = None
-                continue
-
-            visited = set()
-            queue = [(sensor, [sensor])]
-            found = False
-
-            while queue:
-                current, path = queue.pop(0)
-                if current in visited:
-                    continue
-                visited.add(current)
-
-                for neighbor in sensor_graph.get(current, []):
-                    if neighbor == self.central:
-                        self.paths_to_central[sensor] = path + [self.central]
-                        sensor.next_hop = self.paths_to_central[sensor][1]
-                        found = True
-                        break
-                    else:
-                        queue.append((neighbor, path + [neighbor]))
-
-                if found:
-                    break
+        for (x, y), value in zip(np.asarray(coords, dtype=np.int64).tolist(), np.asarray(reliability).tolist()):
+            self.unobserved_pois.add(self.poi_store.add((x, y), value))
+
+    def _topology_cache(self):
+        """
+        Return the topology cache of this run, or None when caching does not apply:
+        no cache directory is set, the seed is not fixed or a scenario fixes part of the layout.
+        """
+        root = self.settings.get_topology_cache()
+        if not root or self.settings.get_seed() is None or (self.scenario is not None and self.scenario.fixes_layout()):
+            return None
+        return topology.TopologyCache(root)
+
+    def _load_topology(self):
+        """
+        Restore the placed sensors and POIs and their graph from the topology cache.
+
+        :return: True if the layout was loaded, False if it has to be generated.
+        """
+        cache = self._topology_cache()
+        if cache is None:
+            return False
+        cached = cache.get(self.settings)
+        if cached is None:
+            return False
+        self.topology = cached
+        self.near_sensors = int(cached.near_sensors)
+        sensor_range = self.settings.get_srange()
+        coords = np.asarray(cached.sensor_xy, dtype=np.int64)
+        self.central = self._add_sensor(tuple(coords[0].tolist()), sensor_range, True)
+        self._add_sensors(coords[1:], sensor_range)
+        self.store.trim()
+        self._add_pois(cached.poi_xy, cached.poi_reliability)
+        return True
+
+    def _save_topology(self):
+        """
+        Store the generated layout and its graph in the topology cache, if one is used.
+        """
+        cache = self._topology_cache()
+        if cache is not None:
+            cache.put(self.settings, self.topology)
 
-            if not found:
-                self.paths_to_central[sensor] = None
-                sensor.in_path = False
+    def _init_routing(self):
+        """
+        Build static neighbor lists (sensors within half their radius), the sensors able to observe
+        every POI (closer than half their radius) and the initial routing tree.
+        """
+        if self.topology is None:
+            n, poi_num = len(self.store), len(self.poi_store)
+            self.topology = topology.Topology.build(
+                np.column_stack([self.store.x[:n], self.store.y[:n]]).astype(np.int64),
+                self.near_sensors,
+                np.column_stack([self.poi_store.x[:poi_num], self.poi_store.y[:poi_num]]).astype(np.int64),
+                self.poi_store.reliability[:poi_num].copy(),
+                self.settings.get_srange(),
+            )
+        self.neighbors = self.topology.neighbors()
+        self.poi_candidates = self.topology.candidates()
+
+        self.routing = routing.RoutingTree(self.neighbors, self.central.index)
+        self.routing.build(self.in_network(np.arange(len(self.store))))
+        self.state_changes.clear()
+        self._sync_next_hops()
+
+    def in_network(self, indexes):
+        """
+        Return a mask of sensors that can relay packets (active or sleeping); the central node always can.
+
+        :param indexes: Array of sensor indexes to check.
+        """
+        state = self.store.state[indexes]
+        return (state == s.State.ACTIVE.value) | (state == s.State.SLEEP.value) | (indexes == self.central.index)
+
+    def _sync_next_hops(self):
+        """
+        Copy parent pointers of sensors whose route changed into the store's next_hop column.
+        """
+        changed = np.fromiter(self.routing.pop_changed(), dtype=np.int64)
+        self.store.next_hop[changed] = self.routing.parent[changed]
+        self.store.in_path[changed] = self.routing.hops[changed] >= 0
+        if self.trace is not None:
+            self.trace.record_hops(changed, self.store.next_hop[changed], self.store.in_path[changed])
+
+    def find_path_to_central(self):
+        """
+        Keep each sensor's path to the central sensor up to date.
+        Only sensors that changed state since the last call are passed to the routing tree,
+        which repairs the affected subtrees. Sensors outside of communication range have no path (None).
+        """
+        if not self.state_changes:
+            return
+        changes = np.unique(np.array(self.state_changes, dtype=np.int64))
+        self.state_changes.clear()
+        self.routing.update(zip(changes.tolist(), self.in_network(changes).tolist()))
+        self._sync_next_hops()
 
     def sleep_idle_sensors(self):
         """
-        Put sensors to sleep if they are not observing any POI and are not part of any critical path.
-        Sensors without own path and not in others’ paths are also put to sleep.
+        Put sensors to sleep if they are not observing any POI and are not part of any critical path,
+        i.e. no POI-observing sensor routes its packets through them.
+        The routing tree keeps relay counts up to date, so the decision is a vectorized O(1) per sensor.
         """
-        for sensor in self.sensors:
-            if sensor.state == s.State.DEAD:
-                return
-            if sensor.if_pois_observed(): 
-                continue # Sensor observes POIs, stays awake
-            has_own_path = self.paths_to_central.get(sensor) is not None
-            in_other_path = any(sensor in path for s, path in self.paths_to_central.items() if path and s != sensor)
-            # Sleep sensors with no own path and not in others’ paths
-            if not has_own_path and not in_other_path:
-                sensor.sleep()
-                continue
-
-            # Sleep if not critical: not in path to sensor that observes POIs
-            is_critical = any(sensor in path for s, path in self.paths_to_central.items()
-                              if s != sensor and path and s.if_pois_observed())
-            if not is_critical:
-                sensor.sleep()
-            else:
-                sensor.state = s.State.ACTIVE
+        # Sensors observing POIs stay awake, dead ones are left alone
+        idle = (self.store.state != s.State.DEAD.value) & ~self.routing.observing
+        relay = self.routing.relay_count > 0
+        self.store.set_states(np.flatnonzero(idle & relay), s.State.ACTIVE)
+        self.store.set_states(np.flatnonzero(idle & ~relay), s.State.SLEEP)
 
     def generate_packets_in_pois(self, prob):
         """
-        Generate data packets in each POI with probability `prob`.
+        Generate data packets in each POI with probability `prob`, as one batched draw.
 
         :param prob: Probability that a POI generates a packet during this call.
         """
-        for dot in self.pois:
-            dot.generate_data(prob)
+        self.poi_store.generate(prob, self.sim_time, self.rng.packets)
 
     def scan_pois(self):
         """
-        Each sensor scans the POIs in range to update which POIs it observes.
+        Assign every unobserved POI to the first (lowest index) sensor that is not dead and has it in range.
+        Observed POIs never change hands, so only unobserved ones are scanned.
+        Sensors in range of every POI are precomputed in ascending order, so the scan stops at the first live one.
+        The routing tree is told which sensors observe POIs to keep relay counts current.
         """
-        for sensor in self.sensors:
-            sensor.scan_pois(self.pois)
+        state = self.store.state
+        dead = s.State.DEAD.value
+        # Fixed order: observing a POI wakes up its path, which can change the candidates of the next one
+        for dot in sorted(self.unobserved_pois, key=lambda dot: dot.index):
+            observer = None
+            for index in self.poi_candidates[dot.index]:
+                if state[index] != dead:
+                    observer = self.sensors[index]
+                    break
+            if observer is not None:
+                observer.observe(dot)
+                self.unobserved_pois.discard(dot)
+                self.routing.set_observing(observer.index, True)
+
+    def release_pois(self, indexes):
+        """
+        Release all POIs observed by the given (dead) sensors.
+
+        :param indexes: Iterable of sensor indexes.
+        """
+        for index in indexes:
+            for dot in self.store.visible.pop(index, ()):
+                dot.observed_by = None
+                self.unobserved_pois.add(dot)
+            self.routing.set_observing(index, False)
+
+    @property
+    def stats(self):
+        """Human-readable stats lines built from the latest stats_values."""
+        return format_stats(self.stats_values) if self.stats_values else []
+
+    def subscribe_stats(self, callback):
+        """
+        Register a consumer (plot, log, remote viewer) of the stats.
+
+        :param callback: Function called with stats_values every time they are updated.
+        """
+        self.stats_listeners.append(callback)
+
+    def unsubscribe_stats(self, callback):
+        """
+        Remove a consumer registered with subscribe_stats.
+
+        :param callback: Previously registered function.
+        """
+        self.stats_listeners.remove(callback)
 
     def create_stats(self):
         """
@@ -245,49 +404,247 @@ class Simulation:
         - Number of active, sleeping, dead, failed sensors
         - Number of packets in network and at central node
         - Number of lost packets
-        Update the live plot with average battery level.
+        All values are read from the running counters of the sensor store, so this is O(1).
+        The average battery level is kept in `avg_battery` for plotting,
+        numeric values of all stats in `stats_values`, which are passed to all subscribers.
         If no active sensors remain, stop simulation.
         """
-        active_sensors = sum(1 for se in self.sensors if se.state == s.State.ACTIVE)
+        st = self.store
+        counts = st.state_counts
+        active_sensors = int(counts[s.State.ACTIVE.value])
         if active_sensors == 0: 
             self.STOP_SIM = True
             return
         
-        avg_battery = sum(se.curr_battery for se in self.sensors if se.state == s.State.ACTIVE) / active_sensors
-        sleeping_sensors = sum(1 for se in self.sensors if se.state == s.State.SLEEP) - 1
-        total_packets = sum(len(se.data_packets) for se in self.sensors)
-        dead_sensors = sum(1 for se in self.sensors if se.state == s.State.DEAD)
-        lost_packets = sum(se.lost_packets for se in self.sensors)
-        failed_sensors = sum(1 for se in self.sensors if se.state == s.State.FAILURE)
-        self.live_plot.update(avg_battery)
-        self.stats = [
-            f"Average battery level: {avg_battery:.1f}%",
-            f"Active sensors: {active_sensors}",
-            f"Sleeping sensors: {sleeping_sensors}",
-            f"Dead sensors: {dead_sensors}",
-            f"Packets in the network: {total_packets}",
-            f"Packets at the central node: {len(self.central.data_packets)}",
-            f"Lost packets: {lost_packets}",
-            f"Failed sensors: {failed_sensors}",
-        ]
-
-    def draw_stats(self):
-        """
-        Render the current simulation statistics on the screen.
-        """
-        font = p.font.SysFont('Tahoma', 20)
-        for i, text in enumerate(self.stats):
-            img = font.render(text, True, (0,0,0))
-            self.screen.blit(img, (25,50 + i * 30))
-
-    def draw_sensors_pois(self):
-        """
-        Draw all sensors and POIs on the screen.
-        """
-        for sensor in self.sensors:
-            sensor.draw()
-        for poi in self.pois:
-            poi.draw()
+        avg_battery = st.active_battery / active_sensors
+        self.avg_battery = avg_battery
+        self.stats_values = {
+            "avg_battery": avg_battery,
+            "active": active_sensors,
+            "sleeping": int(counts[s.State.SLEEP.value]) - 1,
+            "dead": int(counts[s.State.DEAD.value]),
+            "packets": st.total_packets,
+            "delivered": int(st.packets[self.central.index]),
+            "lost": st.total_lost,
+            "failed": int(counts[s.State.FAILURE.value]),
+        }
+        for callback in self.stats_listeners:
+            callback(self.stats_values)
+
+    def perform_sensor_actions(self, current_time, failure_prob):
+        """
+        Vectorized per-tick behavior of all active sensors:
+        - Depleted sensors die and release their POIs
+        - Random failures
+        - Idle battery drain
+        - Forwarding packets to the next hop (with up to 10% loss) once enough are buffered
+        - Periodic collection of POI data
+        Forwarding decisions use the buffers from the start of the tick.
+
+        :param current_time: Simulation time in milliseconds.
+        :param failure_prob: Probability of a random failure of each active sensor.
+        """
+        st = self.store
+        n = len(st)
+        active = st.state[:n] == s.State.ACTIVE.value
+
+        # Check if battery is depleted
+        depleted = np.flatnonzero(active & (st.battery[:n] <= 0))
+        if depleted.size:
+            st.set_states(depleted, s.State.DEAD)
+            self.release_pois(depleted.tolist())
+            active[depleted] = False
+
+        # Simulate sensor failures
+        failed = self.draw_failures(active, failure_prob)
+        if failed.size:
+            st.set_states(failed, s.State.FAILURE)
+            active[failed] = False
+
+        # Idle battery drain
+        st.drain(np.flatnonzero(active & ~st.is_central), self.battery_drain_idle)
+
+        # Forward data if enough packets and the next hop is awake
+        senders = np.flatnonzero(active & ~st.is_central & (st.packets >= self.min_packet_to_send) & (st.next_hop >= 0))
+        senders = senders[st.state[st.next_hop[senders]] == s.State.ACTIVE.value]
+        if senders.size:
+            self.forward_packets(senders)
+
+        # Periodically collect data from POIs
+        collecting = active & (current_time - st.last_collect >= self.COLLECT_INTERVAL)
+        if collecting.any():
+            st.drain(np.flatnonzero(collecting), self.battery_drain_receive)
+            st.last_collect[collecting] = current_time
+            self.collect_packets(collecting)
+
+    def draw_failures(self, active, failure_prob):
+        """
+        Decide which active sensors fail during this step.
+
+        :param active: Boolean mask of active sensors.
+        :param failure_prob: Probability of a failure of each active sensor, 0 when failures are disabled.
+        :return: Array of failing sensor indexes.
+        """
+        if self.due_failures is not None:
+            # Already drawn by fast_forward for the whole skipped stretch
+            due = self.due_failures[active[self.due_failures]]
+            self.due_failures = None
+            return due
+        if failure_prob <= 0:
+            return np.empty(0, dtype=np.int64)
+        return np.flatnonzero(active & (self.rng.failures.random(len(active)) < failure_prob))
+
+    def current_failure_prob(self):
+        """
+        Return the per-step failure probability of active sensors; failures are disabled
+        once more than half as many sensors failed as are active.
+        """
+        counts = self.store.state_counts
+        if counts[s.State.FAILURE.value] / counts[s.State.ACTIVE.value] > 0.5:
+            return 0
+        return self.failure_prob
+
+    def has_pending_work(self):
+        """
+        Return True if the next step has to repair routes, scan POIs or forward packets.
+        """
+        if self.state_changes or self.unobserved_pois:
+            return True
+        st = self.store
+        n = len(st)
+        active = st.state[:n] == s.State.ACTIVE.value
+        forwarding = active & ~st.is_central[:n] & (st.packets[:n] >= self.min_packet_to_send) & (st.next_hop[:n] >= 0)
+        return bool((st.state[st.next_hop[:n][forwarding]] == s.State.ACTIVE.value).any())
+
+    def next_sensor_work(self):
+        """
+        Return the first step after the current one at which an active sensor collects POI data
+        or is found depleted, computed from the collection timers and the linear idle drain.
+
+        :return: Step number, or None if no sensor is active.
+        """
+        st = self.store
+        n = len(st)
+        active = st.state[:n] == s.State.ACTIVE.value
+        if not active.any():
+            return None
+        now = self.steps
+        collect = int(np.ceil((st.last_collect[:n][active].min() + self.COLLECT_INTERVAL) / self.TICK_MS))
+
+        # The depletion check at step now + j sees the battery after j - 1 idle drains
+        battery = st.battery[:n][active]
+        draining = ~st.is_central[:n][active] & (battery > 0)
+        if (battery <= 0).any():
+            deplete = now + 1
+        elif draining.any():
+            deplete = now + 1 + int(np.ceil(battery[draining].min() / self.battery_drain_idle))
+        else:
+            deplete = collect
+        return max(now + 1, min(collect, deplete))
+
+    def advance_idle(self, steps):
+        """
+        Advance the clock over steps in which nothing but the idle battery drain happens,
+        draining all active non-central sensors in one operation.
+
+        :param steps: Number of steps to skip.
+        """
+        st = self.store
+        n = len(st)
+        idle = np.flatnonzero((st.state[:n] == s.State.ACTIVE.value) & ~st.is_central[:n])
+        st.drain(idle, self.battery_drain_idle * steps)
+        self.steps += steps
+        self.sim_time += steps * self.TICK_MS
+
+    def fast_forward(self, max_steps=None):
+        """
+        Skip analytically to just before the next step that can change the topology or move packets:
+        a collection, a battery depletion or a random failure. Batteries are drained in closed form,
+        POI measurements due in the skipped stretch are generated in order, and the first failure is
+        drawn from the geometric distribution of the per-step failure probability and applied on
+        the following step. Does nothing if the next step has work to do.
+
+        :param max_steps: Optional limit of skipped steps.
+        :return: Number of skipped steps.
+        """
+        if self.STOP_SIM or self.has_pending_work():
+            return 0
+        next_work = self.next_sensor_work()
+        if next_work is None:
+            return 0
+        horizon = next_work - self.steps - 1
+        if max_steps is not None:
+            horizon = min(horizon, max_steps)
+
+        failure_prob = self.current_failure_prob()
+        if failure_prob > 0 and horizon > 0:
+            n = len(self.store)
+            active = np.flatnonzero(self.store.state[:n] == s.State.ACTIVE.value)
+            first = self.rng.failures.geometric(failure_prob, active.size)
+            # The draw also decides the step right after the stretch, which must not draw again
+            self.due_failures = np.empty(0, dtype=np.int64)
+            if first.min() <= horizon + 1:
+                horizon = int(first.min()) - 1
+                self.due_failures = active[first == first.min()]
+        if horizon <= 0:
+            return 0
+
+        # POI data generation does not depend on sensors, so rounds due in the stretch run now
+        end = self.steps + horizon
+        while True:
+            step = m.ceil((self.last_gen_packet_time + self.GEN_PACKET_INTERVAL) / self.TICK_MS)
+            if step > end:
+                break
+            self.last_gen_packet_time = step * self.TICK_MS
+            self.poi_store.generate(self.prob_gen_packet, self.last_gen_packet_time, self.rng.packets)
+        self.advance_idle(horizon)
+        self.create_stats()
+        return horizon
+
+    def collect_packets(self, collecting):
+        """
+        Release pending measurements of all POIs observed by collecting sensors.
+        The packets are appended to the packet store as one block ordered by sensor,
+        so every sensor receives a single contiguous span.
+
+        :param collecting: Boolean mask of sensors collecting this tick.
+        """
+        observer = self.poi_store.observer[:len(self.poi_store)]
+        pois = np.flatnonzero((observer >= 0) & collecting[np.maximum(observer, 0)])
+        pois = pois[np.argsort(observer[pois], kind="stable")]
+        temperature, timestamp, poi_id, counts = self.poi_store.release(pois)
+        if not temperature.size:
+            return
+        start, _ = self.packets.append(temperature, timestamp, poi_id)
+
+        per_sensor = np.bincount(observer[pois], weights=counts, minlength=len(self.store)).astype(np.int64)
+        receivers = np.flatnonzero(per_sensor)
+        self.store.add_packets(receivers, per_sensor[receivers])
+        for index, count in zip(receivers.tolist(), per_sensor[receivers].tolist()):
+            packetStore.extend_spans(self.store.buffers[index], [(start, start + count)])
+            start += count
+
+    def forward_packets(self, senders):
+        """
+        Move buffered packets of the given sensors to their next hops, simulating random loss.
+
+        :param senders: Array of sensor indexes that forward this tick.
+        """
+        st = self.store
+        hops = st.next_hop[senders]
+        totals = st.packets[senders]
+        lost = self.rng.loss.integers(0, (totals // 10) + 1)  # Simulate up to 10% random packet loss
+        st.drain(senders, self.battery_drain_send)
+        st.drain(hops, self.battery_drain_receive)
+
+        # Take all outgoing spans first so a sender that is also a next hop only forwards its own
+        outgoing = []
+        for index, count in zip(senders.tolist(), lost.tolist()):
+            outgoing.append(packetStore.drop_front(st.buffers[index], count))
+            st.buffers[index] = []
+        for hop, spans in zip(hops.tolist(), outgoing):
+            packetStore.extend_spans(st.buffers[hop], spans)
+        st.move_packets(senders, hops, lost)
 
     def perform_actions(self):
         """
@@ -298,36 +655,60 @@ class Simulation:
         - Check if any POI is unobserved, stop simulation if so
         - Update sensor states (battery, failure)
         - Generate new data packets periodically
+        Each call advances the simulation clock by TICK_MS.
         """
-        current_time = p.time.get_ticks()
-        
         if not self.STOP_SIM:
+            self.sim_time += self.TICK_MS
+            self.steps += 1
+            current_time = self.sim_time
+            prof = self.profiler
+            t = prof.start()
+
             self.scan_pois()
+            t = prof.lap("scan", t)
             self.find_path_to_central()
+            t = prof.lap("routing", t)
             self.sleep_idle_sensors()
+            t = prof.lap("sleep", t)
 
             # Stop simulation if any POI is not observed
-            for poi in self.pois:
-                if poi.observed_by == None:
-                    self.STOP_SIM = True
-                    return
-
-            failed_sensors = sum(1 for se in self.sensors if se.state == s.State.FAILURE)
-            active_sensors = sum(1 for se in self.sensors if se.state == s.State.ACTIVE)
+            if self.unobserved_pois:
+                self.STOP_SIM = True
+                return
 
-            if active_sensors == 0: 
+            if self.store.state_counts[s.State.ACTIVE.value] == 0: 
                 self.STOP_SIM = True
                 return
 
-            failure_prob = 0.00001
-            if failed_sensors / active_sensors > 0.5:
-                failure_prob = 0  # Disable failures if too many sensors failed
+            failure_prob = self.current_failure_prob()
+            t = prof.lap("coverage", t)
 
-            for sensor in self.sensors:
-                sensor.perform_action(self.min_packet_to_send, self.battery_drain_idle, self.battery_drain_receive, failure_prob)
+            self.perform_sensor_actions(current_time, failure_prob)
+            t = prof.lap("sensors", t)
             self.create_stats()
+            t = prof.lap("stats", t)
 
-            # Generate packets in POIs every 1 second (1000 ms)
-            if current_time - self.last_gen_packet_time >= 1000:
+            # Generate packets in POIs every 1 second of simulation time
+            if current_time - self.last_gen_packet_time >= self.GEN_PACKET_INTERVAL:
                 self.generate_packets_in_pois(self.prob_gen_packet)
                 self.last_gen_packet_time = current_time
+            prof.lap("packets", t)
+
+    def run(self, max_steps=None, fast_forward=False):
+        """
+        Advance the simulation without any display until it stops on its own
+        or `max_steps` steps have been performed.
+
+        :param max_steps: Optional limit of steps; None runs until STOP_SIM.
+        :param fast_forward: Skip idle stretches analytically with fast_forward() between steps.
+        :return: Final list of statistics lines.
+        """
+        start = self.steps
+        while not self.STOP_SIM:
+            if max_steps is not None and self.steps - start >= max_steps:
+                break
+            if fast_forward:
+                left = None if max_steps is None else max_steps - (self.steps - start) - 1
+                self.fast_forward(left)
+            self.perform_actions()
+        return self.stats
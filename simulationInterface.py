@@ -1,7 +1,15 @@
+import numpy as np
 import pygame as p
 import game as g
 import simulation as s
 import sensor as se
+import liveGraph as graph
+import renderCache as cache
+import scheduler
+import simulationWorker as worker
+import telemetry
+import eventTrace
+import viewport
 
 class SimulationInterface:
     def __init__(self, screen, game, settings, width, height):
@@ -22,7 +30,25 @@ class SimulationInterface:
         self._init_var()
         self._init_text()
         self._init_shapes()
-        self.simulation = s.Simulation(self.screen, settings, width, height, self.SIM_SIZE, self.DIST_FROM_EDGE)
+        self.replay = settings.get_replay() is not None
+        self.remote = settings.get_worker() and not self.replay
+        if self.replay:
+            # A recorded run is played back from its trace; nothing is simulated
+            self.simulation = eventTrace.TraceReplay(settings.get_replay())
+        elif self.remote:
+            # The model runs in its own process; only its published snapshots are rendered here
+            self.simulation = worker.RemoteSimulation(settings, g.FPS)
+        else:
+            self.simulation = s.Simulation(settings)
+            self.telemetry = telemetry.attach(self.simulation, settings)
+            self.trace = eventTrace.attach(self.simulation, settings)
+        # Pan/zoom mapping of the world onto the simulation area of the screen
+        self.viewport = viewport.Viewport(self.sim_rect, self.simulation.WORLD_SIZE)
+        # Initialize live plot for sensor activity visualization
+        self.live_plot = self._create_live_plot()
+        self._init_render_cache()
+        # Runs N simulation ticks per displayed frame depending on the selected speed
+        self.scheduler = scheduler.StepScheduler(self.simulation.TICK_MS, g.FPS)
     
     def _init_var(self):
         """
@@ -35,6 +61,17 @@ class SimulationInterface:
         self.BACK_HOVERED = False
         self.SENSOR_SIZE = 7
         self.POI_SIZE = 10
+        self.SPEED_KEYS = [p.K_1, p.K_2, p.K_3, p.K_4] # 1x, 10x, 100x, max
+        self.telemetry = None # TelemetryWriter of a local simulation; a worker records its own
+        self.trace = None # TraceRecorder of a local simulation; a worker records its own
+        self.SEEK_STEPS = 625 # Steps skipped by the arrow keys during replay (10 s of simulation time)
+        self.ZOOM_STEP = 1.25 # Zoom factor of one mouse wheel notch
+        self.DETAIL_LIMIT = 3000 # Sensors in view above which a density map is drawn instead of single nodes
+        self.DENSITY_CELL = 4 # Side (px) of a density map cell
+        self.DENSITY_FULL = 4 # Sensors in a cell at which it gets the full color
+        self.drag = None # Last mouse position while the view is dragged
+        self.density = False # Whether the last frame drew sensors as a density map
+        self.stats_saved = False # Final stats are written to the log once per run
 
     def _init_colors(self):
         """
@@ -44,6 +81,12 @@ class SimulationInterface:
         self.GREY = (170,170,170)
         self.WHITE = (255, 255, 255)
         self.RED = (100,0,0)
+        self.CIRCLE = (100, 100, 100)
+        self.CIRCLE_CENTRAL = (255, 128, 0)
+        self.PATH = (240, 240, 240)
+        self.POI_COLOR = (153, 100, 153)
+        # Sensor colors indexed by color_classes()
+        self.PALETTE = np.array([color.value for color in (se.LifeBattery.GREEN, se.LifeBattery.YELLOW, se.LifeBattery.RED, se.LifeBattery.SLEEP, se.LifeBattery.FAILURE)], dtype=np.float64)
 
     def _init_text(self):
         """
@@ -53,6 +96,31 @@ class SimulationInterface:
         self.stop_sim_text = p.font.SysFont('Tahoma', 22).render('POIs are not covered. Simulation has been stopped.', True, self.RED)
         self.start_again_txt = p.font.SysFont('Tahoma', 22).render('Go back to start again.', True, self.RED)
 
+    def _create_live_plot(self):
+        """
+        Create the live plot of battery, sensor state counts and packet counters.
+        Sensor counts are shown as a share of all sensors, packet counters relative to their largest value.
+        """
+        sensors_num = max(len(self.simulation.sensors), 1)
+        series = [
+            ("avg_battery", "battery", (0, 0, 255), 100),
+            ("active", "active", (0, 160, 0), sensors_num),
+            ("sleeping", "sleeping", (60, 60, 60), sensors_num),
+            ("dead", "dead", (200, 40, 40), sensors_num),
+            ("delivered", "delivered", self.CIRCLE_CENTRAL, None),
+            ("lost", "lost", self.POI_COLOR, None),
+        ]
+        return graph.LivePlot(self.screen, p.Rect(50, 520, 400, 150), "Sensor activity over time (H: whole run)", max_points=80, series=series)
+
+    def _init_render_cache(self):
+        """
+        Initialize the text and sprite caches and the static layer with borders, legend and plot grid.
+        """
+        self.text_cache = cache.TextCache()
+        self.sprites = cache.SpriteCache() # Pre-rendered dots, POIs and range circles
+        self.static_layer = cache.StaticLayer((self.SCREEN_WIDTH, self.SCREEN_HEIGHT))
+        self.static_layer.rebuild(self.draw_static)
+
     def _init_shapes(self):
         """
         Initialize pygame Rect objects for UI elements positions and sizes.
@@ -65,51 +133,291 @@ class SimulationInterface:
         self.back_text_coords = p.Rect(30, 10, 80, 30)
         self.back_button_rect = p.Rect(25, 10, 80, 30)
         self.back_button_hovered = self.back_button_rect
+        self.speed_text_coords = p.Rect(125, 15, 300, 30)
+        self.view_text_coords = p.Rect(125, 33, 300, 20)
+        self.profiler_coords = p.Rect(25, 300, 400, 200)
         self.stop_sim_text_coords = p.Rect(25,300,50, 50)
         self.start_again_text_coords = p.Rect(25,325,50, 50)
+        self.timeline_rect = p.Rect(50, 455, 400, 8)
+        self.timeline_text_coords = p.Rect(50, 432, 400, 20)
+
+    def draw_static(self, surface):
+        """
+        Draw everything that does not change between frames onto the static layer:
+        background boxes around the simulation area, the back button, the legend and the plot grid.
+
+        :param surface: Surface of the static layer.
+        """
+        p.draw.rect(surface, self.BLACK, self.sim_rect, 1)
+        p.draw.rect(surface, self.WHITE, self.left_white)
+        p.draw.rect(surface, self.WHITE, self.up_white)
+        p.draw.rect(surface, self.WHITE, self.right_white)
+        p.draw.rect(surface, self.WHITE, self.down_white)
+        surface.blit(self.back_text, self.back_text_coords)
+        p.draw.rect(surface, self.BLACK, self.back_button_rect, 1)
+        self.draw_legend(surface)
+        self.live_plot.draw_static(surface)
 
     def draw(self):
         """
         Draw the main simulation interface elements including background boxes and buttons.
         """
-        p.draw.rect(self.screen, self.BLACK, self.sim_rect, 1)
-        p.draw.rect(self.screen, self.WHITE, self.left_white)
-        p.draw.rect(self.screen, self.WHITE, self.up_white)
-        p.draw.rect(self.screen, self.WHITE, self.right_white)
-        p.draw.rect(self.screen, self.WHITE, self.down_white)
+        self.static_layer.blit(self.screen)
         if self.BACK_HOVERED:
             p.draw.rect(self.screen, self.GREY, self.back_button_hovered)
-        self.screen.blit(self.back_text, self.back_text_coords)
-        p.draw.rect(self.screen, self.BLACK, self.back_button_rect, 1)
+            self.screen.blit(self.back_text, self.back_text_coords)
+            p.draw.rect(self.screen, self.BLACK, self.back_button_rect, 1)
 
-    def draw_legend(self):
+    def draw_legend(self, surface):
         """
         Draw the legend explaining sensor battery states and POI representation.
+
+        :param surface: Surface to draw on.
+        """
+        legend = [
+            (se.LifeBattery.GREEN.value, 0, 'sensor battery above 50%'),
+            (se.LifeBattery.YELLOW.value, 0, 'sensor battery below 50%'),
+            (se.LifeBattery.RED.value, 200, 'sensor battery below 20%'),
+            (se.LifeBattery.SLEEP.value, 200, 'sensor in sleep mode'),
+            (se.LifeBattery.FAILURE.value, 400, 'sensor failed'),
+        ]
+        for i, (color, offset_x, text) in enumerate(legend):
+            offset_y = 15 if i % 2 == 0 else 35
+            p.draw.rect(surface, color, (self.sim_x + offset_x, self.sim_y - offset_y, self.SENSOR_SIZE, self.SENSOR_SIZE), border_radius=self.SENSOR_SIZE)
+            surface.blit(self.text_cache.render('Tahoma', 15, text, self.BLACK), p.Rect(self.sim_x + 15 + offset_x, self.sim_y - offset_y - 5, 80, 30))
+        p.draw.rect(surface, self.POI_COLOR, p.Rect(self.sim_x + 400, self.sim_y - 35, self.POI_SIZE, self.POI_SIZE), 0, border_radius=2)
+        surface.blit(self.text_cache.render('Tahoma', 15, 'POI', self.BLACK), p.Rect(self.sim_x + 15 + 400, self.sim_y - 40, 80, 30))
+
+    def draw_links(self, indexes):
+        """
+        Draw a line from every given active sensor to its active next hop.
+
+        :param indexes: Array of sensor indexes.
+        """
+        sensor_store = self.simulation.store
+        active = se.State.ACTIVE.value
+        hops = sensor_store.next_hop[indexes]
+        linked = (sensor_store.state[indexes] == active) & (hops >= 0) & ~sensor_store.is_central[indexes]
+        linked[linked] &= sensor_store.state[hops[linked]] == active
+        x1, y1 = self.viewport.to_screen(sensor_store.x[indexes[linked]], sensor_store.y[indexes[linked]])
+        x2, y2 = self.viewport.to_screen(sensor_store.x[hops[linked]], sensor_store.y[hops[linked]])
+        for start_x, start_y, end_x, end_y in zip(x1.tolist(), y1.tolist(), x2.tolist(), y2.tolist()):
+            p.draw.line(self.screen, self.PATH, (start_x, start_y), (end_x, end_y), 2)
+
+    def blit_sprites(self, sprites, x, y, size):
+        """
+        Draw sprites centered at screen positions with one Surface.blits call.
+
+        :param sprites: List with the sprite of every position.
+        :param x: Array of screen x coordinates of the centers.
+        :param y: Array of screen y coordinates of the centers.
+        :param size: Side of the sprites in pixels.
+        """
+        corners = zip((x - size / 2).astype(np.int64).tolist(), (y - size / 2).astype(np.int64).tolist())
+        self.screen.blits(list(zip(sprites, corners)), False)
+
+    def draw_nodes(self, indexes):
+        """
+        Draw the sensing circles of the central node and of active sensors, then the dots of all
+        given sensors. Shapes come pre-rendered from the sprite cache, so every group of equal
+        circles and the whole dot layer take one Surface.blits call each.
+        The dots keep their size on screen, the circles are scaled with the view.
+
+        :param indexes: Array of sensor indexes.
+        """
+        sensor_store = self.simulation.store
+        x, y = self.viewport.to_screen(sensor_store.x[indexes], sensor_store.y[indexes])
+        central = sensor_store.is_central[indexes]
+        ringed = central | (sensor_store.state[indexes] == se.State.ACTIVE.value)
+        sizes = self.viewport.length(sensor_store.radius[indexes]).astype(np.int64)
+        for color, members in ((self.CIRCLE, ringed & ~central), (self.CIRCLE_CENTRAL, central)):
+            for size in np.unique(sizes[members]).tolist():
+                group = members & (sizes == size)
+                sprite = self.sprites.get(color, size, 1, size)
+                if sprite is not None:
+                    self.blit_sprites([sprite] * int(group.sum()), x[group], y[group], size)
+                    continue
+                # Circles wider than the sprite cache allows only appear at a deep zoom
+                for center in zip(x[group].tolist(), y[group].tolist()):
+                    p.draw.circle(self.screen, color, center, size / 2, 1)
+        dots = [self.sprites.get(tuple(int(c) for c in color), self.SENSOR_SIZE, 0, self.SENSOR_SIZE) for color in self.PALETTE]
+        self.blit_sprites([dots[k] for k in self.color_classes(indexes).tolist()], x, y, self.SENSOR_SIZE)
+
+    def draw_pois(self, indexes):
+        """
+        Draw the given POIs with one Surface.blits call.
+
+        :param indexes: Array of POI indexes.
+        """
+        poi_store = self.simulation.poi_store
+        x, y = self.viewport.to_screen(poi_store.x[indexes], poi_store.y[indexes])
+        sprite = self.sprites.get(self.POI_COLOR, self.POI_SIZE, 0, 2)
+        self.blit_sprites([sprite] * len(indexes), x, y, self.POI_SIZE)
+
+    def color_classes(self, indexes):
+        """
+        Vectorized Sensor.set_battery_color: return the PALETTE row of every given sensor.
+
+        :param indexes: Array of sensor indexes.
+        """
+        sensor_store = self.simulation.store
+        state = sensor_store.state[indexes]
+        battery = sensor_store.battery[indexes]
+        full = sensor_store.max_battery
+        conditions = [state == se.State.FAILURE.value, state == se.State.SLEEP.value, battery >= full / 2, battery >= full / 5]
+        return np.select(conditions, [4, 3, 0, 1], 2)
+
+    def draw_density(self, indexes, poi_indexes):
+        """
+        Draw nodes as a density map: the view is split into small cells, each filled with the
+        mean color of its sensors and blended with the background by their number.
+        Cells holding a POI are painted in the POI color on top.
+
+        :param indexes: Array of sensor indexes around the view.
+        :param poi_indexes: Array of POI indexes in the view.
         """
-        p.draw.rect(self.screen, se.LifeBattery.GREEN.value, (self.sim_x, self.sim_y - 15, self.SENSOR_SIZE, self.SENSOR_SIZE), border_radius=self.SENSOR_SIZE)
-        self.screen.blit(p.font.SysFont('Tahoma', 15).render('sensor battery above 50%', True, self.BLACK), p.Rect(self.sim_x + 15, self.sim_y - 20, 80, 30))
-        p.draw.rect(self.screen, se.LifeBattery.YELLOW.value, (self.sim_x, self.sim_y - 35, self.SENSOR_SIZE, self.SENSOR_SIZE), border_radius=self.SENSOR_SIZE)
-        self.screen.blit(p.font.SysFont('Tahoma', 15).render('sensor battery below 50%', True, self.BLACK), p.Rect(self.sim_x + 15, self.sim_y - 40, 80, 30))
-        p.draw.rect(self.screen, se.LifeBattery.RED.value, (self.sim_x + 200, self.sim_y - 15, self.SENSOR_SIZE, self.SENSOR_SIZE), border_radius=self.SENSOR_SIZE)
-        self.screen.blit(p.font.SysFont('Tahoma', 15).render('sensor battery below 20%', True, self.BLACK), p.Rect(self.sim_x + 15+200, self.sim_y - 20, 80, 30))
-        p.draw.rect(self.screen, se.LifeBattery.SLEEP.value, (self.sim_x + 200, self.sim_y - 35, self.SENSOR_SIZE, self.SENSOR_SIZE), border_radius=self.SENSOR_SIZE)
-        self.screen.blit(p.font.SysFont('Tahoma', 15).render('sensor in sleep mode', True, self.BLACK), p.Rect(self.sim_x + 15 + 200, self.sim_y - 40, 80, 30))
-        p.draw.rect(self.screen, se.LifeBattery.FAILURE.value, (self.sim_x + 400, self.sim_y - 15, self.SENSOR_SIZE, self.SENSOR_SIZE), border_radius=self.SENSOR_SIZE)
-        self.screen.blit(p.font.SysFont('Tahoma', 15).render('sensor failed', True, self.BLACK), p.Rect(self.sim_x + 15 + 400, self.sim_y - 20, 80, 30))
-        p.draw.rect(self.screen, (153, 100, 153), p.Rect(self.sim_x + 400, self.sim_y - 35, self.POI_SIZE, self.POI_SIZE), 0, border_radius=2)
-        self.screen.blit(p.font.SysFont('Tahoma', 15).render('POI', True, self.BLACK), p.Rect(self.sim_x + 15 + 400, self.sim_y - 40, 80, 30))
+        sensor_store = self.simulation.store
+        poi_store = self.simulation.poi_store
+        indexes = indexes[self.viewport.visible(sensor_store.x[indexes], sensor_store.y[indexes])]
+        cell = self.DENSITY_CELL
+        cells, columns, rows = self.viewport.grid_cells(sensor_store.x[indexes], sensor_store.y[indexes], cell)
+        colors = len(self.PALETTE)
+        counts = np.bincount(cells * colors + self.color_classes(indexes), minlength=columns * rows * colors).reshape(-1, colors)
+        total = counts.sum(axis=1)
+        mean = counts @ self.PALETTE / np.maximum(total, 1)[:, None]
+        weight = np.minimum(total / self.DENSITY_FULL, 1)[:, None]
+        pixels = (255 * (1 - weight) + mean * weight).astype(np.uint8)
+        poi_cells, _, _ = self.viewport.grid_cells(poi_store.x[poi_indexes], poi_store.y[poi_indexes], cell)
+        pixels[poi_cells] = self.POI_COLOR
+        surface = p.surfarray.make_surface(pixels.reshape(columns, rows, 3))
+        self.screen.blit(p.transform.scale(surface, (columns * cell, rows * cell)), self.sim_rect.topleft)
+
+    def draw_sensors_pois(self):
+        """
+        Draw paths, sensors and POIs inside the viewport. Nodes outside the view are culled;
+        with more than DETAIL_LIMIT sensors or POIs in view they are drawn as a density map instead.
+        """
+        sensor_store = self.simulation.store
+        poi_store = self.simulation.poi_store
+        n, m = len(sensor_store), len(poi_store)
+        self.screen.set_clip(self.sim_rect)
+        # Keep sensors whose sensing circle may reach into the view
+        margin = int(sensor_store.radius[:n].max()) / 2 if n else 0
+        shown = np.flatnonzero(self.viewport.visible(sensor_store.x[:n], sensor_store.y[:n], margin))
+        half = self.POI_SIZE / 2
+        shown_pois = np.flatnonzero(self.viewport.visible(poi_store.x[:m], poi_store.y[:m], half / self.viewport.scale))
+        self.density = max(len(shown), len(shown_pois)) > self.DETAIL_LIMIT
+        if self.density:
+            self.draw_density(shown, shown_pois[self.viewport.visible(poi_store.x[shown_pois], poi_store.y[shown_pois])])
+            self.draw_nodes(np.array([self.simulation.central.index]))
+        else:
+            self.draw_links(shown)
+            self.draw_nodes(shown)
+            self.draw_pois(shown_pois)
+        self.screen.set_clip(None)
+
+    def draw_stats(self):
+        """
+        Render the current simulation statistics on the screen.
+        """
+        for i, text in enumerate(self.simulation.stats):
+            img = self.text_cache.render('Tahoma', 20, text, self.BLACK)
+            self.screen.blit(img, (25,50 + i * 30))
+
+    def draw_speed(self):
+        """
+        Draw the selected simulation speed and the number of ticks run in the last frame.
+        """
+        text = f"speed {self.scheduler.get_speed_label()} ({self.scheduler.last_ticks} ticks/frame), keys 1-4"
+        self.screen.blit(self.text_cache.render('Tahoma', 15, text, self.BLACK), self.speed_text_coords)
+
+    def draw_view(self):
+        """
+        Draw the zoom level of the viewport and how to change it.
+        """
+        zoom = self.viewport.scale / self.viewport.fit_scale
+        mode = ", density view" if self.density else ""
+        text = f"zoom {zoom:.1f}x{mode} (wheel zooms, drag pans, F fits)"
+        self.screen.blit(self.text_cache.render('Tahoma', 15, text, self.BLACK), self.view_text_coords)
+
+    def draw_profiler(self):
+        """
+        Draw p50/p99 step phase and render timings below the stats when profiling is enabled.
+        """
+        prof = self.simulation.profiler
+        if not prof.enabled:
+            return
+        header = self.text_cache.render('Tahoma', 13, "phase        p50 ms    p99 ms", self.GREY)
+        self.screen.blit(header, self.profiler_coords)
+        for i, (name, row) in enumerate(prof.summary().items()):
+            text = f"{name:<12} {row['p50']:>7.3f}   {row['p99']:>7.3f}"
+            img = self.text_cache.render('Tahoma', 13, text, self.BLACK)
+            self.screen.blit(img, (self.profiler_coords.x, self.profiler_coords.y + 16 * (i + 1)))
+
+    def draw_timeline(self):
+        """
+        Draw the replay position on a timeline bar with the replayed and total simulation time.
+        """
+        sim = self.simulation
+        text = f"replay {sim.sim_time / 1000:.1f} s / {sim.last_step * sim.TICK_MS / 1000:.1f} s (arrows seek, click the bar)"
+        self.screen.blit(self.text_cache.render('Tahoma', 15, text, self.BLACK), self.timeline_text_coords)
+        p.draw.rect(self.screen, self.GREY, self.timeline_rect)
+        done = self.timeline_rect.copy()
+        done.width = int(self.timeline_rect.width * sim.steps / max(sim.last_step, 1))
+        p.draw.rect(self.screen, self.CIRCLE_CENTRAL, done)
+
+    def seek(self, step):
+        """
+        Jump the replay to a step.
+
+        :param step: Target step.
+        """
+        self.simulation.seek(step)
+        self.scheduler.accumulator = 0.0
+        # The plot samples wall-clock time, so its history restarts at the new position
+        show_history = self.live_plot.show_history
+        self.live_plot = self._create_live_plot()
+        self.live_plot.show_history = show_history
 
     def simulation_stop(self):
         """
         Stop the simulation, display stop messages and save stats to a log file.
+        The log is written only on the first call, not on every frame of the stop screen.
         """
         self.screen.blit(self.stop_sim_text, self.stop_sim_text_coords)
         self.screen.blit(self.start_again_txt, self.start_again_text_coords)
+        if self.stats_saved or self.replay:
+            return
+        self.stats_saved = True
+        if self.telemetry is not None:
+            self.telemetry.flush()
         sim_stats = self.simulation.stats
         with open("stats_log.txt", "w") as file:
             for line in sim_stats:
                 file.write(line + "\n")
 
+    def close(self):
+        """
+        Finish the telemetry and trace files and stop the model process when the simulation runs in worker mode.
+        """
+        if self.telemetry is not None:
+            self.telemetry.close()
+        if self.trace is not None:
+            self.trace.close()
+        if self.remote:
+            self.simulation.close()
+
+    def advance(self):
+        """
+        Advance the model for this frame: step it locally or pull the worker's latest snapshot.
+        """
+        if self.remote:
+            self.scheduler.last_ticks = self.simulation.refresh()
+        else:
+            self.scheduler.advance(self.simulation)
+            if self.replay:
+                self.simulation.refresh()
+
     def handle_mouse_hovered(self, event):
         """
         Handle mouse hover events, changing cursor and button state.
@@ -130,10 +438,16 @@ class SimulationInterface:
         :param event: pygame event for mouse button down
         """
         if event.button == 1:
+            if self.sim_rect.collidepoint(event.pos):
+                self.drag = event.pos
+            if self.replay and self.timeline_rect.inflate(0, 10).collidepoint(event.pos):
+                share = (event.pos[0] - self.timeline_rect.x) / self.timeline_rect.width
+                self.seek(share * self.simulation.last_step)
             if self.back_button_rect.collidepoint(event.pos):
                 self.simulation.STOP_SIM = False
                 p.mouse.set_cursor(p.SYSTEM_CURSOR_ARROW)
                 self.simulation_stop()
+                self.close()
                 self.game.change_scene(g.Scene.MENU)
 
     def handle_event(self, event):
@@ -144,27 +458,64 @@ class SimulationInterface:
         """
         if event.type == p.QUIT:
             self.simulation_stop()
+            self.close()
             p.quit()
             quit()
         if event.type == p.MOUSEBUTTONDOWN:
             self.handle_mouse_pressed(event)
         if event.type == p.MOUSEMOTION:
             self.handle_mouse_hovered(event)
+            if self.drag is not None:
+                self.viewport.pan(event.pos[0] - self.drag[0], event.pos[1] - self.drag[1])
+                self.drag = event.pos
+        if event.type == p.MOUSEBUTTONUP and event.button == 1:
+            self.drag = None
+        if event.type == p.MOUSEWHEEL and self.sim_rect.collidepoint(p.mouse.get_pos()):
+            self.viewport.zoom(self.ZOOM_STEP ** event.y, p.mouse.get_pos())
+        if event.type == p.KEYDOWN and event.key == p.K_f:
+            self.viewport.fit()
+        if event.type == p.KEYDOWN and event.key == p.K_h:
+            self.live_plot.toggle_history()
+        if event.type == p.KEYDOWN and event.key == p.K_p:
+            # Toggle step/render profiling and its overlay
+            prof = self.simulation.profiler
+            prof.enabled = not prof.enabled
+            prof.reset()
+        if self.replay and event.type == p.KEYDOWN and event.key in (p.K_LEFT, p.K_RIGHT, p.K_HOME):
+            if event.key == p.K_HOME:
+                self.seek(0)
+            else:
+                direction = 1 if event.key == p.K_RIGHT else -1
+                self.seek(self.simulation.steps + direction * self.SEEK_STEPS)
+        if event.type == p.KEYDOWN and event.key in self.SPEED_KEYS:
+            self.scheduler.set_speed(self.SPEED_KEYS.index(event.key))
+            if self.remote:
+                self.simulation.set_speed(self.scheduler.speed_index)
 
     def render(self):
         """
         Render the simulation interface and simulation elements, or stop screen if simulation stopped.
         """
-        if self.simulation.STOP_SIM == False:
+        if self.simulation.STOP_SIM == False or self.replay:
+            prof = self.simulation.profiler
+            t = prof.start()
             self.screen.fill(self.WHITE)
-            self.simulation.draw_sensors_pois()
+            self.draw_sensors_pois()
             self.draw()
-            self.simulation.perform_actions()
-            self.draw_legend()
-            self.simulation.draw_stats()
-            self.simulation.live_plot.draw()
+            render_time = prof.elapsed(t)
+            self.advance()
+            self.live_plot.update(self.simulation.stats_values or None)
+            t = prof.start()
+            self.draw_stats()
+            self.draw_speed()
+            self.draw_view()
+            self.live_plot.draw_line()
+            self.draw_profiler()
+            if self.replay:
+                self.draw_timeline()
+            prof.record("render", render_time + prof.elapsed(t))
         else:
-            self.simulation.live_plot.paused = True
+            self.live_plot.paused = True
             self.simulation_stop()
 
     def update(self):
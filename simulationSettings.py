@@ -6,6 +6,15 @@ class SimulationSettings:
         self.sensors_num = 0
         self.poi_num = 0
         self.sensors_range = 0
+        self.seed = None # Root seed of the run's random streams, None for a fresh one
+        self.worker = False # Run the model in a separate process
+        self.telemetry = None # File receiving the stats time series, None to disable
+        self.telemetry_interval = 0 # Minimum sim-time (ms) between telemetry rows
+        self.scenario = None # Scenario with an explicit layout, None to place nodes randomly
+        self.topology_cache = None # Directory caching generated layouts of seeded runs, None to disable
+        self.trace = None # Directory receiving a binary event trace of the run, None to disable
+        self.replay = None # Trace directory to play back instead of simulating, None to simulate
+        self.world_size = 640 # Width and height of the simulated area in world units
     
     def set_snum(self, num):
         self.sensors_num = num
@@ -24,4 +33,55 @@ class SimulationSettings:
     
     def get_srange(self):
         return self.sensors_range
-    
\ No newline at end of file
+
+    def set_seed(self, seed):
+        self.seed = seed
+
+    def get_seed(self):
+        return self.seed
+
+    def set_worker(self, worker):
+        self.worker = worker
+
+    def get_worker(self):
+        return self.worker
+
+    def set_telemetry(self, path, interval_ms=0):
+        self.telemetry = path
+        self.telemetry_interval = interval_ms
+
+    def get_telemetry(self):
+        return self.telemetry
+
+    def get_telemetry_interval(self):
+        return self.telemetry_interval
+
+    def set_scenario(self, scenario):
+        self.scenario = scenario
+
+    def get_scenario(self):
+        return self.scenario
+
+    def set_topology_cache(self, path):
+        self.topology_cache = path
+
+    def get_topology_cache(self):
+        return self.topology_cache
+
+    def set_trace(self, path):
+        self.trace = path
+
+    def get_trace(self):
+        return self.trace
+
+    def set_replay(self, path):
+        self.replay = path
+
+    def get_replay(self):
+        return self.replay
+
+    def set_world_size(self, size):
+        self.world_size = size
+
+    def get_world_size(self):
+        return self.world_size
@@ -0,0 +1,246 @@
+import multiprocessing as mp
+import time
+from multiprocessing import shared_memory
+import numpy as np
+import simulation as s
+import sensorStore as store
+import poiStore
+import profiler
+import scheduler
+import telemetry
+import eventTrace
+
+# Extra numeric values published next to the stats fields
+CLOCK_FIELDS = ("sim_time", "steps", "stop")
+
+class SnapshotBuffer:
+    """
+    Two snapshots of the per-sensor state and the stats in one shared memory block.
+    The worker always writes the buffer that is not published and then flips the published
+    index, so the GUI never sees a half-written frame. Every buffer carries a sequence number
+    (odd while being written); a reader that raced the writer simply copies again.
+    """
+    # Per-sensor columns of a snapshot as (name, dtype)
+    COLUMNS = (("state", np.int8), ("battery", np.float32), ("next_hop", np.int32), ("in_path", np.bool_))
+
+    def __init__(self, sensors_num, name=None):
+        """
+        Create a new shared block or attach to an existing one.
+
+        :param sensors_num: Number of sensors in a snapshot.
+        :param name: Name of an existing block to attach to, None to create one.
+        """
+        self.sensors_num = sensors_num
+        self.stats_len = len(s.STATS_FIELDS) + len(CLOCK_FIELDS)
+        layout, buffer_size = self._layout(sensors_num)
+        header_size = 3 * 8 # published index, sequence of buffer 0 and of buffer 1
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=header_size + 2 * buffer_size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.header = np.ndarray(3, dtype=np.int64, buffer=self.shm.buf)
+        self.buffers = []
+        for i in range(2):
+            base = header_size + i * buffer_size
+            views = {}
+            for column, (offset, dtype, length) in layout.items():
+                views[column] = np.ndarray(length, dtype=dtype, buffer=self.shm.buf, offset=base + offset)
+            self.buffers.append(views)
+        if self.owner:
+            self.header[:] = 0
+
+    def _layout(self, sensors_num):
+        """Return offsets of all columns inside one buffer and the 8-byte aligned buffer size."""
+        layout = {}
+        offset = 0
+        for column, dtype in self.COLUMNS + (("stats", np.float64),):
+            length = self.stats_len if column == "stats" else sensors_num
+            offset = (offset + 7) // 8 * 8
+            layout[column] = (offset, dtype, length)
+            offset += length * np.dtype(dtype).itemsize
+        return layout, (offset + 7) // 8 * 8
+
+    def publish(self, sim):
+        """
+        Write the current state of a simulation into the back buffer and publish it.
+
+        :param sim: Simulation running in this process.
+        """
+        back = 1 - int(self.header[0])
+        views = self.buffers[back]
+        n = self.sensors_num
+        self.header[1 + back] += 1 # odd: being written
+        for column, _ in self.COLUMNS:
+            views[column][:] = getattr(sim.store, column)[:n]
+        values = sim.stats_values or {}
+        stats = [values.get(field, 0) for field in s.STATS_FIELDS]
+        views["stats"][:] = stats + [sim.sim_time, sim.steps, sim.STOP_SIM]
+        self.header[1 + back] += 1
+        self.header[0] = back
+
+    def read(self, sensor_store, retries=8):
+        """
+        Copy the latest published snapshot into a local SensorStore.
+
+        :param sensor_store: SensorStore receiving the per-sensor columns.
+        :param retries: How many times to retry a read torn by the writer.
+        :return: Array of the stats values followed by CLOCK_FIELDS.
+        """
+        n = self.sensors_num
+        for attempt in range(retries):
+            current = int(self.header[0])
+            sequence = int(self.header[1 + current])
+            if sequence % 2 and attempt < retries - 1:
+                continue
+            views = self.buffers[current]
+            for column, _ in self.COLUMNS:
+                getattr(sensor_store, column)[:n] = views[column]
+            stats = views["stats"].copy()
+            if int(self.header[1 + current]) == sequence:
+                break
+        # After the last retry a possibly torn frame is shown; the next refresh replaces it
+        return stats
+
+    def close(self):
+        """Detach from the block; the creating side also removes it."""
+        self.header = None
+        self.buffers = []
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def run_worker(sim_settings, conn, fps):
+    """
+    Entry point of the model process: build the simulation, share its static layout over
+    the pipe and keep stepping it, publishing a snapshot every display frame.
+
+    :param sim_settings: SimulationSettings of the run.
+    :param conn: Worker end of a Pipe; receives ('speed', index) and ('stop',) commands.
+    :param fps: Rate at which snapshots are published.
+    """
+    sim = s.Simulation(sim_settings)
+    writer = telemetry.attach(sim, sim_settings)
+    recorder = eventTrace.attach(sim, sim_settings)
+    buffer = SnapshotBuffer(len(sim.sensors))
+    buffer.publish(sim)
+    conn.send({
+        "name": buffer.name,
+        "seed": sim.seed,
+        "tick_ms": sim.TICK_MS,
+        "world_size": sim.WORLD_SIZE,
+        "sensors": [(sensor.coords, sensor.radius, sensor.is_central) for sensor in sim.sensors],
+        "pois": [(dot.coords, dot.reliability) for dot in sim.pois],
+    })
+    steps = scheduler.StepScheduler(sim.TICK_MS, fps, budget=0.95)
+    try:
+        while True:
+            start = time.perf_counter()
+            while conn.poll():
+                command = conn.recv()
+                if command[0] == "speed":
+                    steps.set_speed(command[1])
+                elif command[0] == "stop":
+                    return
+            if not sim.STOP_SIM:
+                steps.advance(sim)
+                buffer.publish(sim)
+            rest = steps.frame_time - (time.perf_counter() - start)
+            if rest > 0:
+                time.sleep(rest)
+    except (EOFError, BrokenPipeError):
+        # GUI went away
+        pass
+    finally:
+        if writer is not None:
+            writer.close()
+        if recorder is not None:
+            recorder.close()
+        buffer.close()
+
+class RemoteSimulation:
+    """
+    GUI-side stand-in for a Simulation running in a worker process.
+    Holds local sensor and POI stores filled once with the static layout, so the usual
+    Sensor and Poi views can be drawn; refresh() copies the latest snapshot into them.
+    """
+    def __init__(self, settings, fps=60):
+        """
+        Start the worker and wait until the network is placed.
+
+        :param settings: SimulationSettings of the run.
+        :param fps: Rate at which the worker publishes snapshots.
+        """
+        # A spawned (not forked) process does not inherit the GUI's SDL state
+        context = mp.get_context("spawn")
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=run_worker, args=(settings, child_conn, fps), daemon=True)
+        self.process.start()
+        child_conn.close()
+        static = self.conn.recv()
+        self._init_stores(static)
+        self.buffer = SnapshotBuffer(len(self.sensors), static["name"])
+        self.seed = static["seed"]
+        self.TICK_MS = static["tick_ms"]
+        self.WORLD_SIZE = static["world_size"]
+        self.profiler = profiler.PhaseProfiler() # Only render timings are recorded GUI-side
+        self.STOP_SIM = False
+        self.stats = []
+        self.stats_values = {}
+        self.avg_battery = 0
+        self.sim_time = 0
+        self.steps = 0
+        self.refresh()
+
+    def _init_stores(self, static):
+        """Rebuild the placed sensors and POIs from the static data sent by the worker."""
+        self.store = store.SensorStore()
+        for coords, radius, central in static["sensors"]:
+            self.store.add(coords, radius, central)
+        self.store.trim()
+        self.sensors = self.store.views
+        self.central = next((sensor for sensor in self.sensors if sensor.is_central), None)
+        self.poi_store = poiStore.PoiStore()
+        for coords, reliability in static["pois"]:
+            self.poi_store.add(coords, reliability)
+        self.pois = self.poi_store.views
+
+    def refresh(self):
+        """
+        Pull the latest snapshot from the worker.
+
+        :return: Number of simulation steps performed since the previous refresh.
+        """
+        values = self.buffer.read(self.store)
+        fields = len(s.STATS_FIELDS)
+        self.stats_values = dict(zip(s.STATS_FIELDS, values[:fields].tolist()))
+        sim_time, steps, stop = values[fields:]
+        done = int(steps) - self.steps
+        self.sim_time = int(sim_time)
+        self.steps = int(steps)
+        self.STOP_SIM = bool(stop)
+        self.avg_battery = self.stats_values["avg_battery"]
+        self.stats = s.format_stats(self.stats_values)
+        return done
+
+    def set_speed(self, index):
+        """
+        Select the worker's speed.
+
+        :param index: Index into StepScheduler.SPEEDS.
+        """
+        self.conn.send(("speed", index))
+
+    def close(self):
+        """Stop the worker process and detach from the shared snapshots."""
+        try:
+            self.conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(1)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.buffer.close()
+        self.conn.close()
@@ -0,0 +1,284 @@
+import argparse
+import copy
+import json
+import math as m
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import batchRunner as batch
+import eventSimulation as ev
+import rngStreams
+import scenario
+import simulation as s
+import simulationSettings as settings
+
+# Parameters a search can size; the other one stays fixed
+PARAMETERS = ("sensors", "range")
+
+def wilson_interval(successes, runs, z=1.96):
+    """
+    Wilson score interval of a success probability; unlike the normal approximation
+    it stays meaningful when all or none of a few runs succeed.
+
+    :param successes: Number of successful runs.
+    :param runs: Number of runs.
+    :param z: Quantile of the standard normal distribution (1.96 for 95%).
+    :return: Tuple (low, high).
+    """
+    if not runs:
+        return 0.0, 1.0
+    share = successes / runs
+    denominator = 1 + z * z / runs
+    center = (share + z * z / (2 * runs)) / denominator
+    half = z * m.sqrt(share * (1 - share) / runs + z * z / (4 * runs * runs)) / denominator
+    return max(0.0, center - half), min(1.0, center + half)
+
+class LayoutPool:
+    """
+    One master layout per replication seed, shared by every candidate of a search.
+    For a sensor count search the master holds the largest count and a candidate takes its first
+    sensors: the ones placed next to POIs and then a random subset of the rest, so replication i of
+    every candidate sees the same POIs and a nested set of sensors. For a range search the master
+    is placed with the smallest range and reused unchanged. Candidates are thus compared on common
+    random layouts, which keeps their outcomes monotone per replication and saves placing them anew.
+    """
+    def __init__(self, base_settings, parameter, low, high):
+        """
+        Initializes the pool.
+
+        :param base_settings: SimulationSettings with the POI count, the fixed parameter and the topology cache.
+        :param parameter: 'sensors' or 'range'.
+        :param low: Smallest candidate value.
+        :param high: Largest candidate value.
+        """
+        self.settings = copy.copy(base_settings)
+        if parameter == "sensors":
+            self.settings.set_snum(high)
+        else:
+            self.settings.set_srange(low)
+        self.parameter = parameter
+        self.layouts = {} # Seed -> master Scenario
+        self.tick_ms = None # Step length of the simulated model
+
+    def master(self, seed):
+        """
+        Return the master layout of a replication seed, placing it on first use
+        (or loading it from the topology cache, if one is set).
+
+        :param seed: Replication seed.
+        :return: Scenario with the sensors in the order candidates take them.
+        """
+        if seed not in self.layouts:
+            master_settings = copy.copy(self.settings)
+            master_settings.set_seed(seed)
+            sim = s.Simulation(master_settings)
+            self.tick_ms = sim.TICK_MS
+            layout = scenario.capture(sim)
+            # Keep the sensors placed next to POIs first, shuffle the others
+            keep = layout.near_sensors
+            rest = layout.sensors[keep:]
+            layout.sensors = np.concatenate([layout.sensors[:keep], rest[np.random.default_rng(seed).permutation(len(rest))]])
+            self.layouts[seed] = layout
+        return self.layouts[seed]
+
+    def settings_for(self, value, seed):
+        """
+        Return the settings of one replication of a candidate.
+
+        :param value: Candidate sensor count or range.
+        :param seed: Replication seed.
+        :return: SimulationSettings with the candidate's layout as scenario.
+        """
+        layout = self.master(seed)
+        sensors, sensors_range = layout.sensors, self.settings.get_srange()
+        if self.parameter == "sensors":
+            sensors = sensors[:max(value - 1, 0)]
+        else:
+            sensors_range = value
+        candidate = scenario.Scenario(sensors_range, sensors, layout.pois, layout.reliability, layout.central, seed=seed)
+        sim_settings = copy.copy(self.settings)
+        candidate.apply(sim_settings)
+        return sim_settings
+
+class SizingSearch:
+    """
+    Search for the smallest sensor count (or range) whose network keeps every POI covered
+    for at least a target time. Candidates are bisected over an integer interval; every
+    candidate is replicated in batches only until a Wilson interval of its success rate lies
+    clearly above or below the required level, and runs stop as soon as they reach the target,
+    so far fewer and shorter simulations are needed than for a full grid.
+    """
+    def __init__(self, base_settings, parameter, target, low, high, level=0.9, z=1.96, min_reps=5, max_reps=40, batch_size=8, tolerance=1, workers=None, engine="frame", fast_forward=False):
+        """
+        Initializes the search.
+
+        :param base_settings: SimulationSettings with the POI count, the fixed parameter, the root seed and the topology cache.
+        :param parameter: 'sensors' or 'range'.
+        :param target: Required coverage time in seconds of simulation time.
+        :param low: Smallest candidate value.
+        :param high: Largest candidate value.
+        :param level: Required share of runs keeping all POIs covered until the target.
+        :param z: Quantile of the standard normal distribution used for the intervals.
+        :param min_reps: Replications of a candidate before it may be decided.
+        :param max_reps: Replications after which a candidate is decided by its success rate alone.
+        :param batch_size: Replications run between two checks of the interval.
+        :param tolerance: Width of the final bracket around the minimum.
+        :param workers: Number of worker processes, defaults to the number of CPUs.
+        :param engine: Key of eventSimulation.ENGINES, 'frame' or 'event'.
+        :param fast_forward: Skip idle stretches analytically between steps.
+        """
+        if parameter not in PARAMETERS:
+            raise ValueError(f"Unknown search parameter: {parameter}")
+        if low > high:
+            raise ValueError("The lower bound of the search is above the upper bound.")
+        self.parameter = parameter
+        self.target = target
+        self.low = low
+        self.high = high
+        self.level = level
+        self.z = z
+        self.min_reps = min_reps
+        self.max_reps = max_reps
+        self.batch_size = batch_size
+        self.tolerance = max(tolerance, 1)
+        self.workers = workers
+        self.engine = engine
+        self.fast_forward = fast_forward
+        root = base_settings.get_seed()
+        self.root_seed = root if root is not None else np.random.SeedSequence().entropy # Reported so a search can be repeated
+        self.seeds = rngStreams.spawn_seeds(self.root_seed, max_reps) # Replication i uses seeds[i] for every candidate
+        self.layouts = LayoutPool(base_settings, parameter, low, high)
+        self.evaluations = {} # Candidate value -> evaluation dict
+        self.pool = None
+
+    def reached(self, result):
+        """Return True if a run kept every POI covered until the target time."""
+        return not result["stopped"] or result["lifetime"] >= self.target
+
+    def evaluate(self, value):
+        """
+        Replicate one candidate until its verdict is statistically clear or max_reps runs are done.
+
+        :param value: Candidate sensor count or range.
+        :return: Dict with the value, runs, successes, interval bounds and whether the target is met.
+        """
+        if value in self.evaluations:
+            return self.evaluations[value]
+        max_steps = m.ceil(self.target * 1000 / self.tick_ms())
+        results = []
+        low, high = 0.0, 1.0
+        while len(results) < self.max_reps:
+            seeds = self.seeds[len(results):len(results) + self.batch_size]
+            count = len(seeds)
+            run_settings = [self.layouts.settings_for(value, seed) for seed in seeds]
+            results += self.pool.map(batch.run_replication, run_settings, [max_steps] * count, seeds, [self.engine] * count, [self.fast_forward] * count)
+            successes = sum(1 for result in results if self.reached(result))
+            low, high = wilson_interval(successes, len(results), self.z)
+            if len(results) >= self.min_reps and (low >= self.level or high < self.level):
+                break
+        share = successes / len(results)
+        evaluation = {
+            "value": value,
+            "runs": len(results),
+            "successes": successes,
+            "ci_low": low,
+            "ci_high": high,
+            "mean_lifetime": float(np.mean([result["lifetime"] for result in results])),
+            "met": low >= self.level or (high >= self.level and share >= self.level),
+        }
+        self.evaluations[value] = evaluation
+        print(f"{self.parameter} {value}: {successes}/{len(results)} runs covered all POIs for {self.target:g} s "
+              f"(95% CI [{low:.2f}, {high:.2f}]) -> {'meets' if evaluation['met'] else 'fails'}")
+        return evaluation
+
+    def tick_ms(self):
+        """Return the step length of the model, placing the first master layout if needed."""
+        if self.layouts.tick_ms is None:
+            self.layouts.master(self.seeds[0])
+        return self.layouts.tick_ms
+
+    def run(self):
+        """
+        Bisect the interval [low, high] for the smallest candidate meeting the target.
+
+        :return: Dict with the minimum (None if even `high` fails), the root seed, the number of simulations and all evaluations.
+        """
+        with ProcessPoolExecutor(max_workers=self.workers) as self.pool:
+            minimum = None
+            if self.evaluate(self.high)["met"]:
+                failing, minimum = self.low - 1, self.high
+                while minimum - failing > self.tolerance:
+                    middle = (failing + minimum) // 2
+                    if self.evaluate(middle)["met"]:
+                        minimum = middle
+                    else:
+                        failing = middle
+        self.pool = None
+        return {
+            "parameter": self.parameter,
+            "minimum": minimum,
+            "root_seed": self.root_seed,
+            "simulations": sum(evaluation["runs"] for evaluation in self.evaluations.values()),
+            "evaluations": [self.evaluations[value] for value in sorted(self.evaluations)],
+        }
+
+def parse_args():
+    """Parse command line arguments of a search."""
+    parser = argparse.ArgumentParser(description="Find the smallest sensor count or range keeping every POI covered for a target time.")
+    parser.add_argument("parameter", choices=PARAMETERS, help="parameter to size")
+    parser.add_argument("pois", type=int, help="number of POIs")
+    parser.add_argument("--target", type=float, required=True, help="required coverage time in seconds of simulation time")
+    parser.add_argument("--sensors", type=int, default=None, help="number of sensors (fixed when sizing the range)")
+    parser.add_argument("--range", type=int, default=None, help="sensors range (fixed when sizing the sensor count)")
+    parser.add_argument("--low", type=int, default=None, help="smallest candidate (default: one sensor per POI plus the central node)")
+    parser.add_argument("--high", type=int, required=True, help="largest candidate")
+    parser.add_argument("--level", type=float, default=0.9, help="required share of runs covering all POIs until the target")
+    parser.add_argument("--min-reps", type=int, default=5, help="replications before a candidate may be decided")
+    parser.add_argument("--max-reps", type=int, default=40, help="maximum replications of a candidate")
+    parser.add_argument("--batch", type=int, default=8, help="replications between two checks of the interval")
+    parser.add_argument("--tolerance", type=int, default=1, help="width of the final bracket around the minimum")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--world-size", type=int, default=640, help="side of the simulated area in world units")
+    parser.add_argument("--seed", type=int, default=None, help="root seed of the search")
+    parser.add_argument("--engine", choices=sorted(ev.ENGINES), default="frame", help="per-frame or discrete-event engine")
+    parser.add_argument("--fast-forward", action="store_true", help="skip idle stretches analytically between steps")
+    parser.add_argument("--topology-cache", default=None, help="directory caching the master layouts")
+    parser.add_argument("--output", default=None, help="optional JSON file for all evaluations")
+    args = parser.parse_args()
+    fixed = "range" if args.parameter == "sensors" else "sensors"
+    if getattr(args, fixed) is None:
+        parser.error(f"--{fixed} is required when sizing the {args.parameter}")
+    if args.low is None:
+        if args.parameter == "range":
+            parser.error("--low is required when sizing the range")
+        args.low = args.pois + 1
+    return args
+
+def main():
+    """Run a search from the command line and print the minimum."""
+    args = parse_args()
+    sim_settings = settings.SimulationSettings()
+    sim_settings.set_pnum(args.pois)
+    sim_settings.set_snum(args.sensors or 0)
+    sim_settings.set_srange(args.range or 0)
+    sim_settings.set_seed(args.seed)
+    sim_settings.set_world_size(args.world_size)
+    sim_settings.set_topology_cache(args.topology_cache)
+
+    search = SizingSearch(sim_settings, args.parameter, args.target, args.low, args.high, args.level,
+                          min_reps=args.min_reps, max_reps=args.max_reps, batch_size=args.batch, tolerance=args.tolerance,
+                          workers=args.workers, engine=args.engine, fast_forward=args.fast_forward)
+    result = search.run()
+    grid = m.ceil((args.high - args.low + 1) / search.tolerance) * args.max_reps
+    if result["minimum"] is None:
+        print(f"Even {args.parameter} {args.high} does not meet the target.")
+    else:
+        print(f"Minimum {args.parameter}: {result['minimum']}")
+    print(f"Root seed: {result['root_seed']}")
+    print(f"Simulations: {result['simulations']} (a full grid would need {grid})")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=2)
+
+if __name__ == "__main__":
+    main()
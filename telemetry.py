@@ -0,0 +1,143 @@
+import json
+import os
+import queue
+import threading
+import numpy as np
+import simulation as s
+
+# Columns of a telemetry row: the simulation clock followed by all stats fields
+COLUMNS = ("sim_time", "steps") + s.STATS_FIELDS
+# Columns holding fractional values; all others are written as integers
+FLOAT_COLUMNS = ("avg_battery",)
+
+class TelemetryWriter:
+    """
+    Streaming time series of the statistics of one run.
+    Rows are collected in a preallocated NumPy block from the stats callback, which only
+    copies a few numbers; full blocks are formatted and written by a background thread,
+    so disk I/O never stalls the simulation step.
+    """
+    FORMATS = ("csv", "jsonl")
+
+    def __init__(self, path, fmt=None, interval_ms=0, batch_rows=4096):
+        """
+        Open the telemetry file and start the writer thread.
+
+        :param path: Output file; an existing file is replaced.
+        :param fmt: 'csv' or 'jsonl'; taken from the file extension when None.
+        :param interval_ms: Minimum simulation time between two rows, 0 for a row per stats update.
+        :param batch_rows: Number of rows handed to the writer thread at once.
+        """
+        if fmt is None:
+            fmt = "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".json") else "csv"
+        if fmt not in self.FORMATS:
+            raise ValueError(f"Unknown telemetry format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self.interval_ms = interval_ms
+        self.batch_rows = batch_rows
+        self.rows = np.empty((batch_rows, len(COLUMNS)), dtype=np.float64)
+        self.count = 0 # Rows filled in the current block
+        self.written = 0 # Rows handed to the writer thread so far
+        self.last_time = None # Sim-time of the latest row
+        self.sim = None
+        self.file = open(path, "w", newline="")
+        if fmt == "csv":
+            self.file.write(",".join(COLUMNS) + "\n")
+        self.row_format = ["%.4f" if column in FLOAT_COLUMNS else "%d" for column in COLUMNS]
+        self.blocks = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def attach(self, sim):
+        """
+        Start recording a simulation: write its current stats and subscribe to updates.
+
+        :param sim: Simulation whose stats are recorded.
+        """
+        self.sim = sim
+        sim.subscribe_stats(self.record)
+        if sim.stats_values:
+            self.record(sim.stats_values)
+
+    def record(self, values):
+        """
+        Stats callback: add a row for the current simulation time.
+        Another update at the same time replaces the row, so every time appears once; the latest
+        row is therefore kept back by flush() and only written once a later time arrives or on close().
+
+        :param values: Dict with the STATS_FIELDS keys.
+        """
+        sim_time = self.sim.sim_time
+        if self.last_time is not None:
+            if sim_time == self.last_time and self.count:
+                self.count -= 1
+            elif sim_time - self.last_time < self.interval_ms:
+                return
+        row = self.rows[self.count]
+        row[0] = sim_time
+        row[1] = self.sim.steps
+        for i, field in enumerate(s.STATS_FIELDS, 2):
+            row[i] = values[field]
+        self.count += 1
+        self.last_time = sim_time
+        if self.count == self.batch_rows:
+            self.flush()
+
+    def flush(self, keep_last=True):
+        """
+        Hand the filled rows to the writer thread and start a new block.
+
+        :param keep_last: Carry the latest row over into the new block, since another update at its time may still replace it.
+        """
+        ready = self.count - 1 if keep_last else self.count
+        if ready <= 0:
+            return
+        rows = np.empty((self.batch_rows, len(COLUMNS)), dtype=np.float64)
+        rows[:self.count - ready] = self.rows[ready:self.count]
+        self.blocks.put(self.rows[:ready])
+        self.written += ready
+        self.rows = rows
+        self.count -= ready
+
+    def _write_loop(self):
+        """Writer thread: format and write blocks until close() sends None."""
+        while True:
+            block = self.blocks.get()
+            if block is None:
+                break
+            if self.fmt == "csv":
+                np.savetxt(self.file, block, fmt=self.row_format, delimiter=",")
+            else:
+                lines = []
+                for row in block.tolist():
+                    record = {column: (value if column in FLOAT_COLUMNS else int(value)) for column, value in zip(COLUMNS, row)}
+                    lines.append(json.dumps(record))
+                self.file.write("\n".join(lines) + "\n")
+
+    def close(self):
+        """Write the remaining rows, stop the writer thread and close the file."""
+        if self.file.closed:
+            return
+        if self.sim is not None:
+            self.sim.unsubscribe_stats(self.record)
+            self.sim = None
+        self.flush(keep_last=False)
+        self.blocks.put(None)
+        self.thread.join()
+        self.file.close()
+
+def attach(sim, sim_settings):
+    """
+    Record the telemetry of a simulation if its settings name a telemetry file.
+
+    :param sim: Simulation to record.
+    :param sim_settings: SimulationSettings of the run.
+    :return: The attached TelemetryWriter, or None when telemetry is disabled.
+    """
+    path = sim_settings.get_telemetry()
+    if not path:
+        return None
+    writer = TelemetryWriter(path, interval_ms=sim_settings.get_telemetry_interval())
+    writer.attach(sim)
+    return writer
@@ -0,0 +1,180 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+
+# Bump when placement or graph construction changes, so older cache entries are not reused
+LAYOUT_VERSION = 3
+
+def radius_csr(points, queries, radius, strict=False, exclude_self=False):
+    """
+    For every query, list the points within `radius` in compressed sparse row form.
+    Points are bucketed into cells of side `radius`, so only the 3x3 cells around a query are
+    compared, and all pairs are generated and filtered with NumPy.
+
+    :param points: Array (n, 2) of point coordinates.
+    :param queries: Array (q, 2) of query coordinates.
+    :param radius: Search radius.
+    :param strict: Use distance < radius instead of <= radius.
+    :param exclude_self: Skip point i for query i (when queries are the points themselves).
+    :return: Tuple (indptr, indices); indices[indptr[i]:indptr[i + 1]] are the points of query i, ascending.
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+    queries = np.asarray(queries, dtype=np.float64).reshape(-1, 2)
+    if not len(points) or not len(queries):
+        return np.zeros(len(queries) + 1, dtype=np.int64), np.empty(0, dtype=np.int32)
+    cell = max(radius, 1)
+    origin = np.minimum(points.min(axis=0), queries.min(axis=0))
+    point_cells = np.floor((points - origin) / cell).astype(np.int64) + 1
+    query_cells = np.floor((queries - origin) / cell).astype(np.int64) + 1
+    rows = int(max(point_cells[:, 1].max(), query_cells[:, 1].max())) + 2
+    keys = point_cells[:, 0] * rows + point_cells[:, 1]
+    order = np.argsort(keys, kind="stable")
+    sorted_keys = keys[order]
+    limit = radius * radius
+    found_queries, found_points = [], []
+    for dx in (-1, 0, 1):
+        for dy in (-1, 0, 1):
+            wanted = (query_cells[:, 0] + dx) * rows + query_cells[:, 1] + dy
+            start = np.searchsorted(sorted_keys, wanted, "left")
+            counts = np.searchsorted(sorted_keys, wanted, "right") - start
+            total = int(counts.sum())
+            if not total:
+                continue
+            query = np.repeat(np.arange(len(queries)), counts)
+            # Position inside every query's run of candidates
+            within = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+            point = order[np.repeat(start, counts) + within]
+            delta = points[point] - queries[query]
+            dist = (delta * delta).sum(axis=1)
+            keep = dist < limit if strict else dist <= limit
+            if exclude_self:
+                keep &= point != query
+            found_queries.append(query[keep])
+            found_points.append(point[keep])
+    query = np.concatenate(found_queries) if found_queries else np.empty(0, dtype=np.int64)
+    point = np.concatenate(found_points) if found_points else np.empty(0, dtype=np.int64)
+    order = np.lexsort((point, query))
+    indptr = np.zeros(len(queries) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(query, minlength=len(queries)), out=indptr[1:])
+    return indptr, point[order].astype(np.int32)
+
+def csr_lists(indptr, indices):
+    """
+    Convert a CSR structure to a list of Python lists (the form the routing code iterates fastest).
+
+    :param indptr: Row offsets.
+    :param indices: Column indexes.
+    :return: List with one list of ints per row.
+    """
+    flat = np.asarray(indices).tolist()
+    bounds = np.asarray(indptr).tolist()
+    return [flat[start:stop] for start, stop in zip(bounds[:-1], bounds[1:])]
+
+class Topology:
+    """
+    Static part of a generated network: node positions, the sensor link graph and, for every POI,
+    the sensors that can observe it. All members are NumPy arrays, so a topology is saved as plain
+    .npy files and can be loaded memory-mapped.
+    """
+    ARRAYS = ("sensor_xy", "near_sensors", "poi_xy", "poi_reliability", "neighbor_indptr", "neighbor_indices", "candidate_indptr", "candidate_indices")
+
+    def __init__(self, **arrays):
+        """
+        Initializes a topology.
+
+        :param arrays: One array per name in ARRAYS. sensor_xy starts with the central node, followed by
+            the near_sensors (a 0-d array) sensors placed next to a POI.
+        """
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def build(cls, sensor_xy, near_sensors, poi_xy, poi_reliability, sensors_range):
+        """
+        Compute the link graph (sensors within half the range) and the POI candidates
+        (sensors closer than half the range) of a placed network.
+
+        :param sensor_xy: Array (n, 2) of sensor positions, central node first.
+        :param near_sensors: Number of sensors after the central node that were placed next to a POI.
+        :param poi_xy: Array (m, 2) of POI positions.
+        :param poi_reliability: Array (m,) of POI reliabilities.
+        :param sensors_range: Range of all sensors.
+        :return: Topology.
+        """
+        neighbor_indptr, neighbor_indices = radius_csr(sensor_xy, sensor_xy, sensors_range / 2, exclude_self=True)
+        candidate_indptr, candidate_indices = radius_csr(sensor_xy, poi_xy, sensors_range / 2, strict=True)
+        return cls(sensor_xy=sensor_xy, near_sensors=np.array(near_sensors, dtype=np.int64), poi_xy=poi_xy, poi_reliability=poi_reliability,
+                   neighbor_indptr=neighbor_indptr, neighbor_indices=neighbor_indices,
+                   candidate_indptr=candidate_indptr, candidate_indices=candidate_indices)
+
+    def neighbors(self):
+        """Return the link graph as a list of neighbor lists."""
+        return csr_lists(self.neighbor_indptr, self.neighbor_indices)
+
+    def candidates(self):
+        """Return, for every POI, the ascending list of sensors that can observe it."""
+        return csr_lists(self.candidate_indptr, self.candidate_indices)
+
+    def save(self, path):
+        """
+        Write all arrays as .npy files into a directory. The directory is filled under a temporary
+        name and renamed at the end, so concurrent runs never see a half-written entry.
+
+        :param path: Directory of the entry.
+        """
+        parent = os.path.dirname(os.path.abspath(path))
+        os.makedirs(parent, exist_ok=True)
+        tmp = tempfile.mkdtemp(dir=parent)
+        try:
+            for name in self.ARRAYS:
+                np.save(os.path.join(tmp, name + ".npy"), np.asarray(getattr(self, name)))
+            os.rename(tmp, path)
+        except OSError:
+            # Another process stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Open a saved topology with all arrays memory-mapped.
+
+        :param path: Directory of the entry.
+        :return: Topology, or None if the entry does not exist or is incomplete.
+        """
+        try:
+            return cls(**{name: np.load(os.path.join(path, name + ".npy"), mmap_mode="r") for name in cls.ARRAYS})
+        except (OSError, ValueError):
+            return None
+
+class TopologyCache:
+    """
+    Directory of saved topologies keyed by everything that determines a random layout:
+    sensor count, POI count, range, seed and the size of the world.
+    """
+    def __init__(self, root):
+        """
+        Initializes the cache.
+
+        :param root: Directory holding one subdirectory per entry.
+        """
+        self.root = root
+
+    def path(self, sim_settings):
+        """
+        Return the entry directory of a layout.
+
+        :param sim_settings: SimulationSettings of the run; its seed must be set.
+        """
+        name = f"v{LAYOUT_VERSION}_s{sim_settings.get_snum()}_p{sim_settings.get_pnum()}_r{sim_settings.get_srange()}_seed{sim_settings.get_seed()}_world{sim_settings.get_world_size()}"
+        return os.path.join(self.root, name)
+
+    def get(self, sim_settings):
+        """Return the cached topology of a layout, or None."""
+        return Topology.load(self.path(sim_settings))
+
+    def put(self, sim_settings, topology):
+        """Store the topology of a layout."""
+        path = self.path(sim_settings)
+        if not os.path.isdir(path):
+            topology.save(path)
@@ -0,0 +1,92 @@
+import numpy as np
+
+class Viewport:
+    """
+    Maps the world coordinates of the model onto a rectangle of the screen.
+    The view is described by the world point shown in the rectangle's top-left corner and a
+    scale in pixels per world unit; panning moves that point, zooming changes the scale
+    around a fixed screen position. All conversions accept scalars or NumPy arrays.
+    """
+    def __init__(self, rect, world_size, max_scale=16.0):
+        """
+        Initializes a viewport showing the whole world.
+
+        :param rect: pygame Rect of the screen area the world is drawn into.
+        :param world_size: Width and height of the world.
+        :param max_scale: Largest zoom in pixels per world unit.
+        """
+        self.rect = rect
+        self.world_size = world_size
+        self.max_scale = max_scale
+        self.fit()
+
+    def fit(self):
+        """Show the whole world, centered in the rectangle."""
+        self.fit_scale = min(self.rect.width, self.rect.height) / self.world_size
+        self.scale = self.fit_scale
+        self.left = (self.world_size - self.rect.width / self.scale) / 2
+        self.top = (self.world_size - self.rect.height / self.scale) / 2
+
+    def zoom(self, factor, pos):
+        """
+        Multiply the scale by factor, keeping the world point under pos in place.
+        The scale is kept between half the fitting scale and max_scale.
+
+        :param factor: Zoom factor, above 1 to zoom in.
+        :param pos: Screen position (x, y) to zoom around.
+        """
+        x, y = self.to_world(pos)
+        self.scale = min(max(self.scale * factor, self.fit_scale / 2), max(self.max_scale, self.fit_scale))
+        self.left = x - (pos[0] - self.rect.x) / self.scale
+        self.top = y - (pos[1] - self.rect.y) / self.scale
+
+    def pan(self, dx, dy):
+        """
+        Move the view by a screen distance, so the content follows a mouse drag.
+
+        :param dx: Horizontal distance in pixels.
+        :param dy: Vertical distance in pixels.
+        """
+        self.left -= dx / self.scale
+        self.top -= dy / self.scale
+
+    def to_screen(self, x, y):
+        """Return the screen coordinates of world coordinates."""
+        return self.rect.x + (x - self.left) * self.scale, self.rect.y + (y - self.top) * self.scale
+
+    def to_world(self, pos):
+        """Return the world coordinates of a screen position."""
+        return self.left + (pos[0] - self.rect.x) / self.scale, self.top + (pos[1] - self.rect.y) / self.scale
+
+    def visible(self, x, y, margin=0):
+        """
+        Return a mask of world points inside the view.
+
+        :param x: Array of world x coordinates.
+        :param y: Array of world y coordinates.
+        :param margin: Extra world distance around the view, e.g. the radius of what is drawn around a point.
+        """
+        right = self.left + self.rect.width / self.scale
+        bottom = self.top + self.rect.height / self.scale
+        return (x >= self.left - margin) & (x <= right + margin) & (y >= self.top - margin) & (y <= bottom + margin)
+
+    def length(self, distance):
+        """Return the number of pixels a world distance spans."""
+        return distance * self.scale
+
+    def grid_cells(self, x, y, cell):
+        """
+        Bin world points into square screen cells covering the rectangle.
+
+        :param x: Array of world x coordinates of points inside the view.
+        :param y: Array of world y coordinates of points inside the view.
+        :param cell: Side of a cell in pixels.
+        :return: Tuple (cell index of every point, columns, rows); cells are numbered column-major,
+            matching the (width, height) layout of pygame.surfarray.
+        """
+        columns = -(-self.rect.width // cell)
+        rows = -(-self.rect.height // cell)
+        sx, sy = self.to_screen(x, y)
+        column = np.clip(((sx - self.rect.x) // cell).astype(np.int64), 0, columns - 1)
+        row = np.clip(((sy - self.rect.y) // cell).astype(np.int64), 0, rows - 1)
+        return column * rows + row, columns, rows